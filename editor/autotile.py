@@ -0,0 +1,187 @@
+import os
+import numpy as np
+import pygame
+from editor.config import Config
+from editor.changes import LevelChange
+from editor.occupancy import OccupancyGrid
+
+# Neighbour bits of a cell mask, clockwise from north, with their (dx, dy)
+N, NE, E, SE, S, SW, W, NW = (1 << i for i in range(8))
+NEIGHBOURS = ((N, 0, -1), (NE, 1, -1), (E, 1, 0), (SE, 1, 1), (S, 0, 1), (SW, -1, 1), (W, -1, 0), (NW, -1, -1))
+CARDINALS = (N, E, S, W)
+
+def _reduce(mask):
+    """Drop the corner bits that do not change the tile (both edges beside the corner must be set)"""
+    for corner, a, b in ((NE, N, E), (SE, S, E), (SW, S, W), (NW, N, W)):
+        if mask & corner and not (mask & a and mask & b):
+            mask &= ~corner
+    return mask
+
+def _build_tables():
+    """Lookup tables from all 256 masks to frame indices, and the mask each frame stands for"""
+    reduced = [_reduce(mask) for mask in range(256)]
+    blob = sorted(set(reduced))  # the 47 distinct 8-neighbour tiles
+    cardinal = sorted(set(mask & (N | E | S | W) for mask in range(256)))  # 16 tiles
+    lookup = {
+        8: np.array([blob.index(mask) for mask in reduced], dtype=np.int16),
+        4: np.array([cardinal.index(mask & (N | E | S | W)) for mask in range(256)], dtype=np.int16)
+    }
+    return lookup, {8: tuple(blob), 4: tuple(cardinal)}
+
+LOOKUP, FRAME_MASKS = _build_tables()
+
+def neighbour_masks(solid, neighbours=8):
+    """Masks of the inner cells of a boolean grid padded by one cell on every side.
+    
+    Each neighbour direction is one shifted slice of the padded grid, so the
+    whole array is done in eight vectorized passes.
+    """
+    height = solid.shape[0] - 2
+    width = solid.shape[1] - 2
+    masks = np.zeros((height, width), dtype=np.uint8)
+    for bit, dx, dy in NEIGHBOURS:
+        if neighbours == 4 and bit not in CARDINALS:
+            continue
+        masks[solid[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]] |= bit
+    return masks
+
+class Autotiler:
+    """Tileset frame of every ground cell, chosen from its neighbours.
+    
+    Frames are worked out a chunk at a time on first use and then kept up to
+    date from the level's change feed: a change only recomputes the cells it
+    touched plus the ring around them, so painting one cell recomputes nine
+    masks. Cells outside the level count as ground when edge_solid is set,
+    so ground running off the level shows no border there.
+    """
+    MAX_PENDING = 256  # queued change rects before the cache is simply dropped
+    
+    def __init__(self, level, neighbours=8, edge_solid=True):
+        self.level = level
+        self.neighbours = neighbours
+        self.edge_solid = edge_solid
+        self.lookup = LOOKUP[neighbours]
+        self.frame_masks = FRAME_MASKS[neighbours]
+        self._frames = {}  # chunk index -> int16 (height, chunk width) array, -1 where not ground
+        self._pending = []  # changed cell rects not applied yet
+        self._surfaces = {}  # cell size -> list of frame surfaces
+        level.add_listener(self.on_level_change)
+    
+    def on_level_change(self, change):
+        if change.type in (LevelChange.LEVEL_RESIZED, LevelChange.CELL_SIZE_CHANGED):
+            self.invalidate()
+        elif change.kind in (OccupancyGrid.GROUND, None) and self._frames:
+            self._pending.append(change.rect)
+            if len(self._pending) > self.MAX_PENDING:
+                self.invalidate()
+    
+    def invalidate(self):
+        """Forget every computed frame"""
+        self._frames.clear()
+        self._pending = []
+    
+    def frames_in_rect(self, x, y, width, height):
+        """Frame indices of a cell rectangle as an int16 (height, width) array, -1 where there is no ground"""
+        self._apply_pending()
+        frames = np.full((max(0, height), max(0, width)), -1, dtype=np.int16)
+        chunk_width = self.level.chunk_width
+        top = max(0, y)
+        bottom = min(self.level.height, y + height)
+        if top >= bottom:
+            return frames
+        for index in range(max(0, x) // chunk_width, (min(self.level.width, x + width) - 1) // chunk_width + 1):
+            offset = index * chunk_width
+            left = max(x, offset)
+            right = min(x + width, offset + chunk_width, self.level.width)
+            frames[top - y:bottom - y, left - x:right - x] = self._chunk_frames(index)[top:bottom, left - offset:right - offset]
+        return frames
+    
+    def frame_at(self, x, y):
+        return int(self.frames_in_rect(x, y, 1, 1)[0, 0])
+    
+    def frame_surfaces(self, cell_size):
+        """One surface per frame, cut from Config.GROUND_TILESET or drawn from the frame masks"""
+        surfaces = self._surfaces.get(cell_size)
+        if surfaces is None:
+            surfaces = self._surfaces[cell_size] = self._load_tileset(cell_size) or \
+                [self._draw_frame(mask, cell_size) for mask in self.frame_masks]
+        return surfaces
+    
+    def _chunk_frames(self, index):
+        frames = self._frames.get(index)
+        if frames is None:
+            chunk_width = self.level.chunk_width
+            frames = self._frames[index] = self._compute(index * chunk_width, 0, chunk_width, self.level.height)
+        return frames
+    
+    def _apply_pending(self):
+        """Recompute the cached frames around the cells changed since the last query"""
+        pending = self._pending
+        self._pending = []
+        chunk_width = self.level.chunk_width
+        for x, y, width, height in pending:
+            # A changed cell alters the masks of its eight neighbours too
+            x, y, width, height = x - 1, y - 1, width + 2, height + 2
+            top = max(0, y)
+            bottom = min(self.level.height, y + height)
+            if top >= bottom:
+                continue
+            for index in range(x // chunk_width, (x + width - 1) // chunk_width + 1):
+                frames = self._frames.get(index)
+                if frames is None:
+                    continue
+                left = max(x, index * chunk_width)
+                right = min(x + width, (index + 1) * chunk_width)
+                offset = index * chunk_width
+                frames[top:bottom, left - offset:right - offset] = self._compute(left, top, right - left, bottom - top)
+    
+    def _compute(self, x, y, width, height):
+        """Frame indices of a cell rectangle, computed from the ground around it"""
+        solid = self.level.occupied(OccupancyGrid.GROUND, x - 1, y - 1, width + 2, height + 2)
+        if self.edge_solid:
+            level_width, level_height = self.level.width, self.level.height
+            solid[:max(0, 1 - y)] = True
+            solid[max(0, level_height - y + 1):] = True
+            solid[:, :max(0, 1 - x)] = True
+            solid[:, max(0, level_width - x + 1):] = True
+        frames = self.lookup[neighbour_masks(solid, self.neighbours)]
+        frames[~solid[1:-1, 1:-1]] = -1
+        return frames
+    
+    def _load_tileset(self, cell_size):
+        """Frames of a tileset strip (square frames left to right, in frame_masks order), or None"""
+        path = Config.GROUND_TILESET
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            sheet = pygame.image.load(path).convert_alpha()
+        except pygame.error as e:
+            print(f"[ERROR] Could not load ground tileset {path}: {e}")
+            return None
+        size = sheet.get_height()
+        if sheet.get_width() < size * len(self.frame_masks):
+            print(f"[ERROR] Ground tileset {path} needs {len(self.frame_masks)} frames")
+            return None
+        return [pygame.transform.scale(sheet.subsurface((i * size, 0, size, size)), (cell_size, cell_size))
+                for i in range(len(self.frame_masks))]
+    
+    def _draw_frame(self, mask, cell_size):
+        """Placeholder frame: ground with a lighter rim on every exposed side and inner corner"""
+        surface = pygame.Surface((cell_size, cell_size))
+        surface.fill((70, 40, 0))
+        rim = max(1, cell_size // 8)
+        far = cell_size - rim
+        if not mask & N:
+            surface.fill((60, 140, 40), (0, 0, cell_size, rim))
+        if not mask & S:
+            surface.fill((45, 25, 0), (0, far, cell_size, rim))
+        if not mask & W:
+            surface.fill((100, 60, 10), (0, 0, rim, cell_size))
+        if not mask & E:
+            surface.fill((100, 60, 10), (far, 0, rim, cell_size))
+        if self.neighbours == 8:
+            for corner, a, b, position in ((NE, N, E, (far, 0)), (SE, S, E, (far, far)),
+                                           (SW, S, W, (0, far)), (NW, N, W, (0, 0))):
+                if mask & a and mask & b and not mask & corner:
+                    surface.fill((100, 60, 10), (*position, rim, rim))
+        return surface
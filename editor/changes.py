@@ -0,0 +1,82 @@
+class LevelChange:
+    """One mutation reported by a Level to its listeners.
+    
+    kind is the element kind (OccupancyGrid.PLATFORM/GROUND/ENEMY, or
+    TileLayer.KIND for tile layers) for element changes and None for
+    level-wide ones. rect is the affected cell
+    rectangle (x, y, width, height); for a resized element it covers both the
+    old and the new extent, except for ground, where it only covers the
+    cells that became or stopped being ground (merging or splitting runs
+    changes no other cell). Bulk edits (fill_rect, move_region, ...) report a
+    single REGION_CHANGED covering everything they touched.
+    """
+    ELEMENT_ADDED = 'element_added'
+    ELEMENT_REMOVED = 'element_removed'
+    ELEMENT_RESIZED = 'element_resized'
+    LEVEL_RESIZED = 'level_resized'
+    CELL_SIZE_CHANGED = 'cell_size_changed'
+    REGION_CHANGED = 'region_changed'
+    
+    __slots__ = ('type', 'kind', 'rect')
+    
+    def __init__(self, change_type, kind, rect):
+        self.type = change_type
+        self.kind = kind
+        self.rect = rect
+    
+    def __repr__(self):
+        return f"LevelChange({self.type}, kind={self.kind}, rect={self.rect})"
+
+class DirtyRegions:
+    """Accumulated set of changed cells, kept as square tiles.
+    
+    Marking is O(tiles touched) and repeated edits of the same area collapse
+    into the same tiles, so the set stays small between drains however many
+    edits happen. drain() hands the regions to a consumer and resets them.
+    """
+    def __init__(self, tile_size=16):
+        self.tile_size = max(1, tile_size)
+        self._tiles = set()  # (tile_x, tile_y)
+        self._everything = None  # (x, y, width, height) after a level-wide change
+    
+    def __bool__(self):
+        return bool(self._tiles) or self._everything is not None
+    
+    def clear(self):
+        self._tiles.clear()
+        self._everything = None
+    
+    def add(self, x, y, width=1, height=1):
+        """Mark a cell rectangle as changed"""
+        if self._everything is not None or width <= 0 or height <= 0:
+            return
+        size = self.tile_size
+        for tile_y in range(y // size, (y + height - 1) // size + 1):
+            for tile_x in range(x // size, (x + width - 1) // size + 1):
+                self._tiles.add((tile_x, tile_y))
+    
+    def add_all(self, width, height):
+        """Mark the whole level as changed (e.g. after a resize)"""
+        self._tiles.clear()
+        self._everything = (0, 0, width, height)
+    
+    def drain(self):
+        """Return the changed cell rectangles and forget them.
+        
+        Tiles next to each other on a tile row are joined into one rectangle.
+        """
+        if self._everything is not None:
+            regions = [self._everything]
+        else:
+            size = self.tile_size
+            regions = []
+            run = None
+            for tile_y, tile_x in sorted((tile_y, tile_x) for tile_x, tile_y in self._tiles):
+                if run and run[1] == tile_y * size and run[0] + run[2] == tile_x * size:
+                    run[2] += size
+                else:
+                    run = [tile_x * size, tile_y * size, size, size]
+                    regions.append(run)
+            regions = [tuple(region) for region in regions]
+        self.clear()
+        return regions
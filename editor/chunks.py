@@ -0,0 +1,253 @@
+from editor.config import Config
+from editor.occupancy import OccupancyGrid
+from editor.elements import GroundRun
+from editor.ground_index import GroundRowIndex
+from editor.enemy_store import EnemyStore, EnemyColumns
+from editor.spatial_hash import SpatialHash
+from editor.changes import LevelChange
+
+class LevelChunk:
+    """Fixed-width slice of level columns and the elements standing in it.
+    
+    Ground runs are clipped to the chunk, so a run crossing a boundary is
+    stored as one piece per chunk and joined back together by the level.
+    Platforms belong to the chunk holding their left edge but are also
+    registered (as the same Platform object) in every chunk they overlap, so
+    hit-tests never have to leave the chunk. Enemy ids come from the chunk's
+    enemy store and are only unique within the chunk.
+    
+    Element coordinates are level coordinates; only the occupancy grid is
+    local to the chunk.
+    """
+    def __init__(self, index, width, height, new_id, notify, columnar_enemies=False, stats=None):
+        self.index = index
+        self.width = width
+        self.x = index * width
+        self.generation = 0  # level snapshot generation this chunk was last copied in
+        self._new_id = new_id  # level-wide id allocator for platforms/ground
+        self._notify = notify  # level change feed: notify(change_type, kind, x, y, width, height)
+        self.stats = stats  # LevelStats kept up to date with this chunk's cells and enemies
+        
+        self.platforms = {}  # id -> Platform overlapping this chunk
+        self.ground = {}     # id -> GroundRun piece inside this chunk
+        self.enemies = EnemyColumns(capacity=64) if columnar_enemies else EnemyStore()
+        self.stores = (self.platforms, self.ground, self.enemies)
+        
+        self.ground_rows = GroundRowIndex()
+        self.platform_index = SpatialHash(Config.PLATFORM_BUCKET_SIZE)
+        self.occupancy = OccupancyGrid(width, height, stats.covered if stats is not None else None)
+    
+    def __repr__(self):
+        return f"LevelChunk(index={self.index}, platforms={len(self.platforms)}, ground={len(self.ground)}, enemies={len(self.enemies)})"
+    
+    def copy(self, generation):
+        """Independent copy of the chunk, used for copy-on-write after a level snapshot.
+        
+        Platform and Enemy objects are never changed in place and are shared
+        with the original; ground pieces are resized in place and are copied.
+        """
+        chunk = LevelChunk.__new__(LevelChunk)
+        chunk.index = self.index
+        chunk.width = self.width
+        chunk.x = self.x
+        chunk.generation = generation
+        chunk._new_id = self._new_id
+        chunk._notify = self._notify
+        chunk.stats = self.stats
+        
+        chunk.platforms = dict(self.platforms)
+        chunk.ground = {ground_id: GroundRun(ground.x, ground.y, ground.width) for ground_id, ground in self.ground.items()}
+        chunk.enemies = self.enemies.copy()
+        chunk.stores = (chunk.platforms, chunk.ground, chunk.enemies)
+        
+        chunk.ground_rows = self.ground_rows.copy()
+        chunk.platform_index = self.platform_index.copy()
+        chunk.occupancy = self.occupancy.copy()
+        return chunk
+    
+    def is_empty(self):
+        return not (self.platforms or self.ground or len(self.enemies))
+    
+    def owns(self, x):
+        """Whether column x falls inside this chunk"""
+        return self.x <= x < self.x + self.width
+    
+    def reset(self, height):
+        """Reallocate the cell lookup for a new level height and re-mark everything"""
+        self.occupancy.reset(self.width, height)
+        self.occupancy.begin_batch()
+        for kind, store in enumerate(self.stores):
+            for element_id, element in store.items():
+                self.mark(kind, element_id, *element.rect)
+        self.occupancy.end_batch()
+    
+    # Cell lookup, in level coordinates
+    
+    def kinds_at(self, x, y):
+        return self.occupancy.kinds_at(x - self.x, y)
+    
+    def id_at(self, kind, x, y):
+        return self.occupancy.id_at(kind, x - self.x, y)
+    
+    def count_at(self, kind, x, y):
+        return self.occupancy.count_at(kind, x - self.x, y)
+    
+    def mark(self, kind, element_id, x, y, width=1, height=1):
+        self.occupancy.mark(kind, element_id, x - self.x, y, width, height)
+    
+    def relabel(self, kind, old_id, new_id, x, y, width=1, height=1):
+        self.occupancy.relabel(kind, old_id, new_id, x - self.x, y, width, height)
+    
+    def unmark(self, kind, element_id, x, y, width=1, height=1):
+        """Unmark cells of an element, relabelling cells it shared with others"""
+        if not self.occupancy.unmark(kind, element_id, x - self.x, y, width, height):
+            return
+        # Hand the shared cells over to the remaining elements on them
+        if kind == OccupancyGrid.PLATFORM:
+            others = self.platform_index.query_rect(x, y, width, height)
+        elif kind == OccupancyGrid.GROUND:
+            others = [ground_id for _, _, ground_id in self.ground_rows.touching(x, y, width)]
+        else:
+            others = self.enemies.ids_at(x, y)
+        for other_id in others:
+            if other_id == element_id:
+                continue
+            ox, oy, owidth, oheight = self.stores[kind][other_id].rect
+            left = max(x, ox)
+            top = max(y, oy)
+            right = min(x + width, ox + owidth)
+            bottom = min(y + height, oy + oheight)
+            if left < right and top < bottom:
+                self.relabel(kind, element_id, other_id, left, top, right - left, bottom - top)
+    
+    # Platforms
+    
+    def add_platform(self, platform_id, platform):
+        self.platforms[platform_id] = platform
+        self.platform_index.insert(platform_id, *platform.rect)
+        self.mark(OccupancyGrid.PLATFORM, platform_id, *platform.rect)
+    
+    def remove_platform(self, platform_id):
+        platform = self.platforms.pop(platform_id)
+        self.platform_index.remove(platform_id)
+        self.unmark(OccupancyGrid.PLATFORM, platform_id, *platform.rect)
+        return platform
+    
+    # Ground
+    
+    def add_ground(self, x, y, width):
+        """Add ground cells [x, x + width) of a row; the range must lie inside the chunk.
+        
+        Returns the (x, width) spans that were not ground before.
+        """
+        # Every piece on this row that overlaps or touches the new cells
+        touching = self.ground_rows.touching(x, y, width)
+        if not touching:
+            ground_id = self._new_id()
+            self.ground[ground_id] = GroundRun(x, y, width)
+            self.ground_rows.add(x, y, width, ground_id)
+            self.mark(OccupancyGrid.GROUND, ground_id, x, y, width)
+            self._notify(LevelChange.ELEMENT_ADDED, OccupancyGrid.GROUND, x, y, width)
+            return [(x, width)]
+        
+        first_start, first_end, ground_id = touching[0]
+        if len(touching) == 1 and first_start <= x and x + width <= first_end:
+            # Already covered by ground
+            return []
+        
+        # Mark the cells that were not ground yet
+        end = x + width
+        cursor = x
+        added = []
+        for run_start, run_end, _ in touching:
+            if run_start > cursor:
+                added.append((cursor, min(run_start, end) - cursor))
+            cursor = max(cursor, run_end)
+        if cursor < end:
+            added.append((cursor, end - cursor))
+        for span_x, span_width in added:
+            self.mark(OccupancyGrid.GROUND, ground_id, span_x, y, span_width)
+        
+        # Fold the other touching pieces into the first one
+        for run_start, run_end, other_id in touching[1:]:
+            self.ground_rows.remove(run_start, y)
+            del self.ground[other_id]
+            self.relabel(OccupancyGrid.GROUND, other_id, ground_id, run_start, y, run_end - run_start)
+        
+        new_x = min(x, first_start)
+        new_width = max(end, touching[-1][1]) - new_x
+        self.ground_rows.update(first_start, y, new_x, new_width)
+        ground = self.ground[ground_id]
+        ground.x = new_x
+        ground.width = new_width
+        # Only the new cells changed; the merged pieces look the same
+        for span_x, span_width in added:
+            self._notify(LevelChange.ELEMENT_RESIZED, OccupancyGrid.GROUND, span_x, y, span_width)
+        return added
+    
+    def erase_ground(self, x, y, width):
+        """Clear ground cells [x, x + width) of a row, returning the (x, width) spans that were ground"""
+        removed = []
+        for run_start, run_end, ground_id in self.ground_rows.touching(x, y, width):
+            left = max(x, run_start)
+            right = min(x + width, run_end)
+            if left < right:
+                self.cut_ground(ground_id, left, right - left)
+                removed.append((left, right - left))
+        return removed
+    
+    def remove_ground(self, ground_id):
+        ground = self.ground.pop(ground_id)
+        self.ground_rows.remove(ground.x, ground.y)
+        self.unmark(OccupancyGrid.GROUND, ground_id, *ground.rect)
+        self._notify(LevelChange.ELEMENT_REMOVED, OccupancyGrid.GROUND, *ground.rect)
+        return ground
+    
+    def cut_ground(self, ground_id, grid_x, width=1):
+        """Remove cells [grid_x, grid_x + width) from a ground piece, splitting it if needed"""
+        ground = self.ground[ground_id]
+        left_width = grid_x - ground.x
+        right_width = ground.x + ground.width - grid_x - width
+        
+        if left_width <= 0 and right_width <= 0:
+            self.remove_ground(ground_id)
+            return
+        
+        y = ground.y
+        self._notify(LevelChange.ELEMENT_RESIZED, OccupancyGrid.GROUND, grid_x, y, width)
+        self.unmark(OccupancyGrid.GROUND, ground_id, grid_x, y, width)
+        if left_width > 0 and right_width > 0:
+            # Deleting from the middle: the original keeps the left side and
+            # a new piece takes over the right side
+            self.ground_rows.update(ground.x, y, ground.x, left_width)
+            ground.width = left_width
+            right = GroundRun(grid_x + width, y, right_width)
+            right_id = self._new_id()
+            self.ground[right_id] = right
+            self.ground_rows.add(right.x, y, right_width, right_id)
+            self.relabel(OccupancyGrid.GROUND, ground_id, right_id, right.x, y, right_width)
+        elif left_width > 0:
+            self.ground_rows.update(ground.x, y, ground.x, left_width)
+            ground.width = left_width
+        else:
+            self.ground_rows.update(ground.x, y, grid_x + width, right_width)
+            ground.x = grid_x + width
+            ground.width = right_width
+    
+    # Enemies
+    
+    def add_enemy(self, enemy):
+        enemy_id = self.enemies.add(enemy)
+        if self.stats is not None:
+            self.stats.enemy_changed(enemy.type_id, 1)
+        self.mark(OccupancyGrid.ENEMY, enemy_id, enemy.x, enemy.y)
+        self._notify(LevelChange.ELEMENT_ADDED, OccupancyGrid.ENEMY, enemy.x, enemy.y)
+        return enemy_id
+    
+    def remove_enemy(self, enemy_id):
+        enemy = self.enemies.remove(enemy_id)
+        if self.stats is not None:
+            self.stats.enemy_changed(enemy.type_id, -1)
+        self.unmark(OccupancyGrid.ENEMY, enemy_id, enemy.x, enemy.y)
+        self._notify(LevelChange.ELEMENT_REMOVED, OccupancyGrid.ENEMY, enemy.x, enemy.y)
+        return enemy
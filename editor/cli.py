@@ -0,0 +1,140 @@
+import argparse
+import json
+from editor.config import Config
+from editor.level import Level
+from editor.validation import validate_level, KIND_NAMES
+
+def load_level_file(path):
+    """Read a level JSON file into a new Level, returning (level, raw data)"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    level = Level()
+    level.from_dict(data)
+    return level, data
+
+def save_level_file(path, level, data):
+    """Write the level's elements back into its original JSON document.
+    
+    Only the element lists and tile layers are replaced, so asset paths,
+    enemy types and metadata written by the editor survive a batch run
+    unchanged.
+    """
+    elements = level.to_dict()
+    for key in ('platforms', 'ground_blocks', 'enemies'):
+        data[key] = elements[key]
+    if 'tile_layers' in elements:
+        data['tile_layers'] = elements['tile_layers']
+    else:
+        data.pop('tile_layers', None)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+def edit_level(path, level, fills, erases):
+    """Apply --fill/--erase rectangles, returning True if the level changed"""
+    changed = False
+    for x, y, width, height in erases or []:
+        if level.erase_rect(x, y, width, height):
+            changed = True
+    for x, y, width, height in fills or []:
+        level.fill_rect(x, y, width, height)
+        changed = True
+    if changed:
+        print(f"{path}: {len(erases or [])} rectangles erased, {len(fills or [])} filled with ground")
+    return changed
+
+def rescale_level(path, level, data, cell_size):
+    """Move the level onto a grid with another cell size and note its new dimensions in data"""
+    old_size = level.cell_size
+    lossy = level.rescale(cell_size)
+    data['dimensions'] = level.to_dict()['dimensions']
+    print(f"{path}: cell size {old_size}px -> {level.cell_size}px, {level.width}x{level.height} cells")
+    for kind, old_rect, new_rect in lossy:
+        if new_rect is None:
+            print(f"{path}: {KIND_NAMES[kind]} {old_rect} is outside the rescaled level, dropped")
+        else:
+            print(f"{path}: {KIND_NAMES[kind]} {old_rect} does not map exactly, now {new_rect}")
+    return old_size != level.cell_size
+
+def compact_level(path, level):
+    before, after = level.compact()
+    print(f"{path}: {before} platforms -> {after}")
+    return after < before
+
+def check_level(path, level):
+    """Print the problems found in a level, returning how many there are"""
+    issues = validate_level(level)
+    for issue in issues:
+        print(f"{path}: {issue.type}: {issue.message}")
+    if not issues:
+        print(f"{path}: OK")
+    return len(issues)
+
+def print_stats(path, level):
+    """Print element counts, covered cells, enemies per type and density per screen"""
+    stats = level.stats
+    screen_columns = Config.WINDOW_WIDTH // max(1, level.cell_size)
+    platforms, ground, enemies = stats.per_screen(level.width, screen_columns)
+    print(f"{path}: {level.width}x{level.height} cells, {stats.summary()}")
+    print(f"{path}: cells covered: " + ", ".join(f"{KIND_NAMES[kind]} {cells}" for kind, cells in enumerate(stats.cells)))
+    print(f"{path}: per screen ({screen_columns} columns): "
+          f"{platforms:.1f} platforms, {ground:.1f} ground cells, {enemies:.1f} enemies")
+    for name, count in sorted(stats.enemies_by_type().items(), key=lambda item: (-item[1], item[0])):
+        print(f"{path}:   {name}: {count}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='main.py',
+        description='Side-scroller level editor. Without options the editor window opens; '
+                    'with options the given level files are processed in batch.'
+    )
+    parser.add_argument('levels', nargs='+', help='level JSON files')
+    parser.add_argument('--compact', action='store_true',
+                        help='merge platform cells into maximal rectangles and save the result')
+    parser.add_argument('--fill', nargs=4, type=int, action='append', metavar=('X', 'Y', 'W', 'H'),
+                        help='fill a cell rectangle with ground (repeatable)')
+    parser.add_argument('--erase', nargs=4, type=int, action='append', metavar=('X', 'Y', 'W', 'H'),
+                        help='remove everything in a cell rectangle (repeatable, applied before --fill)')
+    parser.add_argument('--cell-size', type=int, metavar='PX',
+                        help='move every element onto a grid with this cell size, keeping pixel positions '
+                             '(applied before --fill/--erase, whose rectangles use the new grid)')
+    parser.add_argument('--check', action='store_true',
+                        help='report overlaps, out-of-bounds elements, stacked enemies and unreachable platforms '
+                             '(after any edits; exit status 2 if problems were found)')
+    parser.add_argument('--stats', action='store_true',
+                        help='print element counts, covered cells, enemies per type and density per screen '
+                             '(after any edits)')
+    parser.add_argument('-o', '--output',
+                        help='write the result here instead of overwriting the level (single level only)')
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.output and len(args.levels) > 1:
+        parser.error('--output needs exactly one level file')
+    if not (args.compact or args.fill or args.erase or args.check or args.cell_size or args.stats):
+        parser.error('nothing to do (use --compact, --fill, --erase, --cell-size, --check or --stats)')
+    if args.cell_size is not None and args.cell_size <= 0:
+        parser.error('--cell-size must be positive')
+    
+    problems = 0
+    for path in args.levels:
+        try:
+            level, data = load_level_file(path)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Could not load {path}: {e}")
+            return 1
+        changed = False
+        if args.cell_size and rescale_level(path, level, data, args.cell_size):
+            changed = True
+        if edit_level(path, level, args.fill, args.erase):
+            changed = True
+        if args.compact and compact_level(path, level):
+            changed = True
+        if changed or args.output:
+            save_level_file(args.output or path, level, data)
+        if args.stats:
+            print_stats(path, level)
+        if args.check:
+            problems += check_level(path, level)
+    return 2 if problems else 0
@@ -0,0 +1,39 @@
+import numpy as np
+
+def greedy_mesh(mask):
+    """Cover the True cells of a 2D boolean array with few, large rectangles.
+    
+    Rows are scanned top to bottom. Each uncovered run of cells is widened as
+    far as the row allows and then grown downwards while the whole span
+    below is still uncovered, the classic greedy meshing pass. Returns
+    (x, y, width, height) tuples in array coordinates.
+    """
+    free = np.array(mask, dtype=bool)
+    height = free.shape[0]
+    rects = []
+    for y in range(height):
+        # Runs of free cells on this row, as (start, end) edge pairs
+        padded = np.concatenate(([False], free[y], [False]))
+        edges = np.flatnonzero(padded[1:] != padded[:-1]).tolist()
+        for x, end in zip(edges[::2], edges[1::2]):
+            # Grow down while the whole span stays free
+            bottom = y + 1
+            while bottom < height and free[bottom, x:end].all():
+                bottom += 1
+            free[y:bottom, x:end] = False
+            rects.append((x, y, end - x, bottom - y))
+    return rects
+
+def mesh_rects(rects):
+    """Greedy-mesh the union of cell rectangles, returning level-space rectangles"""
+    rects = [rect for rect in rects if rect[2] > 0 and rect[3] > 0]
+    if not rects:
+        return []
+    left = min(x for x, _, _, _ in rects)
+    top = min(y for _, y, _, _ in rects)
+    right = max(x + width for x, _, width, _ in rects)
+    bottom = max(y + height for _, y, _, height in rects)
+    mask = np.zeros((bottom - top, right - left), dtype=bool)
+    for x, y, width, height in rects:
+        mask[y - top:y - top + height, x - left:x - left + width] = True
+    return [(x + left, y + top, width, height) for x, y, width, height in greedy_mesh(mask)]
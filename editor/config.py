@@ -9,6 +9,8 @@ class Config:
     UI_BG_COLOR = (50, 50, 50)
     UI_FG_COLOR = (200, 200, 200)
     UI_HIGHLIGHT_COLOR = (100, 150, 255)
+    # Placeholder colors for tile ids 1, 2, ... of tile layers (cycled)
+    TILE_COLORS = [(60, 120, 60), (70, 90, 150), (150, 130, 60), (120, 60, 120), (60, 130, 130), (150, 80, 60)]
     
     # UI dimensions
     UI_PANEL_HEIGHT = 64
@@ -19,6 +21,26 @@ class Config:
     DEFAULT_CELL_SIZE = 32
     DEFAULT_LEVEL_WIDTH = 64  # cells
     DEFAULT_LEVEL_HEIGHT = 16  # cells
+    PLATFORM_BUCKET_SIZE = 8  # cells per side of a platform spatial hash bucket
+    ONE_ENEMY_PER_CELL = False  # Placing an enemy replaces the one already on the cell
+    COLUMNAR_ENEMIES = False  # Keep enemies in NumPy columns (for levels with 100k+ enemies)
+    CHUNK_WIDTH = 64  # level columns per storage chunk
+    EXTEND_GROUND_ON_RESIZE = True  # Widening a level extends ground rows that reached the old right edge
+    AUTOTILE_NEIGHBOURS = 8  # 8 for the 47-frame edge/corner set, 4 for the 16-frame edge-only set
+    GROUND_TILESET = 'resources/graphics/ground_tiles.png'  # strip of ground frames; drawn placeholders if missing
+    UNDO_MEMORY_LIMIT = 8 * 1024 * 1024  # bytes of undo history kept before the oldest edits are dropped
+    DIRTY_TILE_SIZE = 16  # cells per side of a dirty-region tile
+    RENDER_TILE_WIDTH = 512  # pixels per baked render tile (rounded down to whole cells)
+    RENDER_CACHE_BYTES = 32 * 1024 * 1024  # baked render tiles kept before the least recently used are dropped
+    
+    # Validation
+    MAX_JUMP_HEIGHT = 4  # cells (of DEFAULT_CELL_SIZE) the player can climb in one jump
+    MAX_JUMP_DISTANCE = 4  # cells (of DEFAULT_CELL_SIZE) the player can cover sideways in one jump
+    VALIDATION_INTERVAL_MS = 500  # minimum time between re-validations in the editor
+    IDLE_TIMEOUT_MS = 250  # longest the main loop sleeps waiting for input when nothing needs redrawing
     
     # File paths
-    LEVELS_DIR = "levels"
\ No newline at end of file
+    LEVELS_DIR = "levels"
+    
+    # Saving
+    COMPACT_ON_SAVE = True  # Write platforms re-meshed into maximal rectangles (the edited level is untouched)
\ No newline at end of file
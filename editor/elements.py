@@ -0,0 +1,114 @@
+import sys
+from editor.enemy_types import ENEMY_TYPES
+
+# Enemy defaults written by the editor (4th frame of the south-facing row)
+DEFAULT_DIRECTION = sys.intern('south')
+DEFAULT_ANIMATION_FRAME = 3
+
+class Platform:
+    """Rectangular platform in cell coordinates"""
+    __slots__ = ('x', 'y', 'width', 'height')
+    
+    def __init__(self, x, y, width, height):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+    
+    def __repr__(self):
+        return f"Platform(x={self.x}, y={self.y}, width={self.width}, height={self.height})"
+    
+    @property
+    def rect(self):
+        return self.x, self.y, self.width, self.height
+    
+    def to_dict(self):
+        return {
+            'x': self.x,
+            'y': self.y,
+            'width': self.width,
+            'height': self.height
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['x'], data['y'], data['width'], data['height'])
+
+class GroundRun:
+    """Horizontal run of ground cells on a single row"""
+    __slots__ = ('x', 'y', 'width')
+    
+    def __init__(self, x, y, width=1):
+        self.x = x
+        self.y = y
+        self.width = width
+    
+    def __repr__(self):
+        return f"GroundRun(x={self.x}, y={self.y}, width={self.width})"
+    
+    @property
+    def rect(self):
+        return self.x, self.y, self.width, 1
+    
+    def to_dict(self):
+        return {
+            'x': self.x,
+            'y': self.y,
+            'width': self.width
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['x'], data['y'], data.get('width', 1))
+
+class Enemy:
+    """Enemy placed on a single cell.
+    
+    The type is kept as its ENEMY_TYPES id (type gives the name) and the
+    direction string is interned, so thousands of enemies share one object
+    per value. Levels saved by older versions may lack direction/
+    animation_frame; those stay None and are left out again when saving so
+    the file round-trips unchanged.
+    """
+    __slots__ = ('x', 'y', 'type_id', 'direction', 'animation_frame')
+    
+    def __init__(self, x, y, enemy_type, direction=DEFAULT_DIRECTION, animation_frame=DEFAULT_ANIMATION_FRAME):
+        # enemy_type is a type name or an ENEMY_TYPES id
+        self.x = x
+        self.y = y
+        self.type_id = enemy_type if isinstance(enemy_type, int) else ENEMY_TYPES.id_of(enemy_type)
+        self.direction = sys.intern(direction) if direction is not None else None
+        self.animation_frame = animation_frame
+    
+    def __repr__(self):
+        return f"Enemy(x={self.x}, y={self.y}, type={self.type!r})"
+    
+    @property
+    def type(self):
+        return ENEMY_TYPES.names[self.type_id]
+    
+    @property
+    def rect(self):
+        return self.x, self.y, 1, 1
+    
+    def to_dict(self):
+        data = {
+            'x': self.x,
+            'y': self.y,
+            'type': self.type
+        }
+        if self.direction is not None:
+            data['direction'] = self.direction
+        if self.animation_frame is not None:
+            data['animation_frame'] = self.animation_frame
+        return data
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data['x'],
+            data['y'],
+            data.get('type', 'armadillo_warrior'),
+            data.get('direction'),
+            data.get('animation_frame')
+        )
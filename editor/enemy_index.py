@@ -0,0 +1,34 @@
+class EnemyIndex:
+    """Hash index of enemy ids by the cell they stand on.
+    
+    Cells normally hold a single enemy, but stacking is allowed unless the
+    level enforces one enemy per cell, so each cell maps to a short list of
+    ids in placement order.
+    """
+    def __init__(self):
+        self._cells = {}  # (x, y) -> [ids]
+    
+    def clear(self):
+        self._cells.clear()
+    
+    def copy(self):
+        """Independent copy of the index"""
+        index = EnemyIndex()
+        index._cells = {cell: list(ids) for cell, ids in self._cells.items()}
+        return index
+    
+    def __contains__(self, cell):
+        return cell in self._cells
+    
+    def add(self, x, y, enemy_id):
+        self._cells.setdefault((x, y), []).append(enemy_id)
+    
+    def remove(self, x, y, enemy_id):
+        ids = self._cells[(x, y)]
+        ids.remove(enemy_id)
+        if not ids:
+            del self._cells[(x, y)]
+    
+    def at(self, x, y):
+        """Ids of the enemies on a cell, oldest first"""
+        return list(self._cells.get((x, y), ()))
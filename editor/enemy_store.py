@@ -0,0 +1,220 @@
+from array import array
+import numpy as np
+from editor.elements import Enemy
+from editor.enemy_types import ENEMY_TYPES
+from editor.enemy_index import EnemyIndex
+
+class EnemyStore:
+    """Default enemy storage: Enemy objects by id plus a cell hash index"""
+    def __init__(self):
+        self._enemies = {}  # id -> Enemy
+        self._cells = EnemyIndex()
+        self._next_id = 0
+    
+    def clear(self):
+        self._enemies.clear()
+        self._cells.clear()
+    
+    def copy(self):
+        """Independent copy of the store (Enemy objects are never changed in place, so they are shared)"""
+        store = EnemyStore()
+        store._enemies = dict(self._enemies)
+        store._cells = self._cells.copy()
+        store._next_id = self._next_id
+        return store
+    
+    def __len__(self):
+        return len(self._enemies)
+    
+    def __iter__(self):
+        return iter(self._enemies.values())
+    
+    def __getitem__(self, enemy_id):
+        return self._enemies[enemy_id]
+    
+    def items(self):
+        return self._enemies.items()
+    
+    def add(self, enemy):
+        """Store an enemy and return its id"""
+        enemy_id = self._next_id
+        self._next_id += 1
+        self._enemies[enemy_id] = enemy
+        self._cells.add(enemy.x, enemy.y, enemy_id)
+        return enemy_id
+    
+    def remove(self, enemy_id):
+        """Remove an enemy by id and return it"""
+        enemy = self._enemies.pop(enemy_id)
+        self._cells.remove(enemy.x, enemy.y, enemy_id)
+        return enemy
+    
+    def ids_at(self, x, y):
+        """Ids of the enemies on a cell, oldest first"""
+        return self._cells.at(x, y)
+    
+    def ids_in_rect(self, x, y, width, height):
+        """Ids of the enemies inside a cell rectangle"""
+        if width * height > len(self._enemies):
+            return [enemy_id for enemy_id, enemy in self._enemies.items()
+                    if x <= enemy.x < x + width and y <= enemy.y < y + height]
+        found = []
+        for cell_y in range(y, y + height):
+            for cell_x in range(x, x + width):
+                found.extend(self._cells.at(cell_x, cell_y))
+        return found
+    
+    def to_dicts(self):
+        return [enemy.to_dict() for enemy in self._enemies.values()]
+
+class EnemyColumns:
+    """Structure-of-arrays enemy storage for very large populations.
+    
+    Each enemy is a slot in parallel NumPy columns (x, y, ENEMY_TYPES id,
+    direction id, animation frame) and its id is the slot number. Deleted slots go on
+    a compact free-list and are reused before the columns grow, so memory is
+    a few bytes per enemy and hit/visibility tests are vectorized.
+    Direction and animation frame use -1 for "not set".
+    """
+    def __init__(self, capacity=64):
+        self._capacity = max(1, capacity)
+        self.clear()
+    
+    def clear(self):
+        capacity = self._capacity
+        self._x = np.zeros(capacity, dtype=np.int32)
+        self._y = np.zeros(capacity, dtype=np.int32)
+        self._type = np.zeros(capacity, dtype=np.int16)
+        self._direction = np.full(capacity, -1, dtype=np.int8)
+        self._frame = np.full(capacity, -1, dtype=np.int16)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._size = 0          # slots handed out so far (high-water mark)
+        self._count = 0         # live enemies
+        self._free = array('i')  # freed slots, reused last-in first-out
+        self.direction_names = []
+        self._direction_ids = {}
+    
+    def copy(self):
+        """Independent copy of the columns and direction table"""
+        columns = EnemyColumns.__new__(EnemyColumns)
+        columns.__dict__.update(self.__dict__)
+        for name in ('_x', '_y', '_type', '_direction', '_frame', '_alive'):
+            setattr(columns, name, getattr(self, name).copy())
+        columns._free = array('i', self._free)
+        columns.direction_names = list(self.direction_names)
+        columns._direction_ids = dict(self._direction_ids)
+        return columns
+    
+    def __len__(self):
+        return self._count
+    
+    def __iter__(self):
+        for slot in self._live_slots():
+            yield self._make(slot)
+    
+    def __getitem__(self, slot):
+        if not (0 <= slot < self._size and self._alive[slot]):
+            raise KeyError(slot)
+        return self._make(slot)
+    
+    def items(self):
+        for slot in self._live_slots():
+            yield slot, self._make(slot)
+    
+    def _live_slots(self):
+        return np.flatnonzero(self._alive[:self._size]).tolist()
+    
+    def _make(self, slot):
+        direction = int(self._direction[slot])
+        frame = int(self._frame[slot])
+        return Enemy(
+            int(self._x[slot]),
+            int(self._y[slot]),
+            int(self._type[slot]),
+            self.direction_names[direction] if direction >= 0 else None,
+            frame if frame >= 0 else None
+        )
+    
+    @staticmethod
+    def _intern(value, names, ids):
+        value_id = ids.get(value)
+        if value_id is None:
+            value_id = ids[value] = len(names)
+            names.append(value)
+        return value_id
+    
+    def _grow(self):
+        """Double the capacity of every column"""
+        capacity = self._capacity * 2
+        for name in ('_x', '_y', '_type', '_direction', '_frame', '_alive'):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._capacity] = column
+            grown[self._capacity:] = -1 if name in ('_direction', '_frame') else 0
+            setattr(self, name, grown)
+        self._capacity = capacity
+    
+    def add(self, enemy):
+        """Store an enemy and return its slot id"""
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._size == self._capacity:
+                self._grow()
+            slot = self._size
+            self._size += 1
+        self._x[slot] = enemy.x
+        self._y[slot] = enemy.y
+        self._type[slot] = enemy.type_id
+        if enemy.direction is None:
+            self._direction[slot] = -1
+        else:
+            self._direction[slot] = self._intern(enemy.direction, self.direction_names, self._direction_ids)
+        self._frame[slot] = -1 if enemy.animation_frame is None else enemy.animation_frame
+        self._alive[slot] = True
+        self._count += 1
+        return slot
+    
+    def remove(self, slot):
+        """Free an enemy slot and return the enemy it held"""
+        enemy = self[slot]
+        self._alive[slot] = False
+        self._free.append(slot)
+        self._count -= 1
+        return enemy
+    
+    def _select(self, x0, y0, x1, y1):
+        size = self._size
+        xs = self._x[:size]
+        ys = self._y[:size]
+        mask = self._alive[:size] & (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+        return np.flatnonzero(mask).tolist()
+    
+    def ids_at(self, x, y):
+        """Slots of the enemies on a cell"""
+        return self._select(x, y, x + 1, y + 1)
+    
+    def ids_in_rect(self, x, y, width, height):
+        """Slots of the enemies inside a cell rectangle"""
+        return self._select(x, y, x + width, y + height)
+    
+    def to_dicts(self):
+        """Build the saved enemy list straight from the columns"""
+        slots = np.flatnonzero(self._alive[:self._size])
+        rows = zip(
+            self._x[slots].tolist(),
+            self._y[slots].tolist(),
+            self._type[slots].tolist(),
+            self._direction[slots].tolist(),
+            self._frame[slots].tolist()
+        )
+        names = ENEMY_TYPES.names
+        enemies = []
+        for x, y, type_id, direction, frame in rows:
+            data = {'x': x, 'y': y, 'type': names[type_id]}
+            if direction >= 0:
+                data['direction'] = self.direction_names[direction]
+            if frame >= 0:
+                data['animation_frame'] = frame
+            enemies.append(data)
+        return enemies
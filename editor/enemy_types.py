@@ -0,0 +1,86 @@
+class EnemyTypeRegistry:
+    """Small integer ids for enemy (character) type names.
+    
+    Ids are handed out in order of first use and never change or get
+    reused while the editor runs, so records, indexes and snapshots can all
+    store the id and turn it back into a name with a list index. Files keep
+    using the names.
+    """
+    def __init__(self):
+        self.names = []
+        self._ids = {}
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def __contains__(self, name):
+        return name in self._ids
+    
+    def id_of(self, name):
+        """Id of a type name, registering the name on first use"""
+        type_id = self._ids.get(name)
+        if type_id is None:
+            type_id = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return type_id
+    
+    def name_of(self, type_id):
+        return self.names[type_id]
+
+# Shared by every level so ids stay the same across chunks, stores and snapshots
+ENEMY_TYPES = EnemyTypeRegistry()
+
+class EnemyImages(dict):
+    """Enemy sprites by type name that can also be looked up by type id.
+    
+    Behaves like the plain dict it replaces; by_id mirrors it as a list
+    indexed by ENEMY_TYPES id (None for types without a sprite) so the
+    renderer does a list index per enemy instead of a string hash.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.by_id = []
+        self.update(*args, **kwargs)
+    
+    def __setitem__(self, name, image):
+        super().__setitem__(name, image)
+        type_id = ENEMY_TYPES.id_of(name)
+        if type_id >= len(self.by_id):
+            self.by_id.extend([None] * (type_id + 1 - len(self.by_id)))
+        self.by_id[type_id] = image
+    
+    def __delitem__(self, name):
+        super().__delitem__(name)
+        self.by_id[ENEMY_TYPES.id_of(name)] = None
+    
+    def sprite(self, type_id):
+        """Sprite of a type id, or None"""
+        return self.by_id[type_id] if type_id < len(self.by_id) else None
+    
+    def update(self, *args, **kwargs):
+        for name, image in dict(*args, **kwargs).items():
+            self[name] = image
+    
+    def setdefault(self, name, image=None):
+        if name not in self:
+            self[name] = image
+        return self[name]
+    
+    def pop(self, name, *default):
+        if name in self:
+            image = self[name]
+            del self[name]
+            return image
+        return super().pop(name, *default)
+    
+    def popitem(self):
+        name, image = super().popitem()
+        self.by_id[ENEMY_TYPES.id_of(name)] = None
+        return name, image
+    
+    def clear(self):
+        super().clear()
+        self.by_id = []
+    
+    def copy(self):
+        return EnemyImages(self)
@@ -3,6 +3,8 @@ import json
 import pygame
 import sys
 from editor.config import Config
+from editor.compaction import mesh_rects
+from editor.elements import Platform
 
 class FileManager:
     def __init__(self, level):
@@ -36,6 +38,14 @@ class FileManager:
         
         try:
             level_data = self.level.to_dict()
+            if Config.COMPACT_ON_SAVE:
+                # Only the file gets the meshed platforms; the level being
+                # edited and its undo history stay as the user drew them
+                platforms = [Platform.from_dict(platform).rect for platform in level_data['platforms']]
+                rects = mesh_rects(platforms)
+                if len(rects) < len(platforms):
+                    level_data['platforms'] = [Platform(*rect).to_dict() for rect in rects]
+                    print(f"[DEBUG] Compacted {len(platforms)} platforms into {len(rects)}")
             with open(filepath, 'w') as f:
                 json.dump(level_data, f, indent=2)
             
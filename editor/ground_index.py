@@ -0,0 +1,70 @@
+from bisect import bisect_left, bisect_right
+
+class GroundRowIndex:
+    """Sorted interval index over the ground blocks of each row.
+    
+    Each row keeps three parallel lists (run starts, run ends and ground ids)
+    sorted by x. Runs in a row never overlap or touch, so both starts and
+    ends are sorted and every lookup is a bisect.
+    """
+    def __init__(self):
+        self._rows = {}  # y -> [starts, ends, ids]
+    
+    def clear(self):
+        self._rows.clear()
+    
+    def copy(self):
+        """Independent copy of the index"""
+        index = GroundRowIndex()
+        index._rows = {y: [list(starts), list(ends), list(ids)] for y, (starts, ends, ids) in self._rows.items()}
+        return index
+    
+    def add(self, x, y, width, ground_id):
+        """Insert a run that does not touch any existing run of the row"""
+        row = self._rows.setdefault(y, [[], [], []])
+        starts, ends, ids = row
+        i = bisect_left(starts, x)
+        starts.insert(i, x)
+        ends.insert(i, x + width)
+        ids.insert(i, ground_id)
+    
+    def remove(self, x, y):
+        """Remove the run starting at x on row y"""
+        starts, ends, ids = self._rows[y]
+        i = bisect_left(starts, x)
+        del starts[i], ends[i], ids[i]
+        if not starts:
+            del self._rows[y]
+    
+    def update(self, old_x, y, x, width):
+        """Move/resize the run starting at old_x without changing its order"""
+        starts, ends, ids = self._rows[y]
+        i = bisect_left(starts, old_x)
+        starts[i] = x
+        ends[i] = x + width
+    
+    def find(self, x, y):
+        """Id of the run covering cell (x, y), or None"""
+        row = self._rows.get(y)
+        if not row:
+            return None
+        starts, ends, ids = row
+        i = bisect_right(starts, x) - 1
+        if i >= 0 and x < ends[i]:
+            return ids[i]
+        return None
+    
+    def touching(self, x, y, width):
+        """(start, end, id) of every run overlapping or adjacent to [x, x + width)"""
+        row = self._rows.get(y)
+        if not row:
+            return []
+        starts, ends, ids = row
+        lo = bisect_left(ends, x)
+        hi = bisect_right(starts, x + width)
+        return list(zip(starts[lo:hi], ends[lo:hi], ids[lo:hi]))
+    
+    def ids(self):
+        """Ground ids in canonical order (top to bottom, left to right)"""
+        for y in sorted(self._rows):
+            yield from self._rows[y][2]
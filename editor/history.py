@@ -0,0 +1,125 @@
+import sys
+from collections import deque
+from contextlib import contextmanager
+
+class UndoJournal:
+    """Undo/redo history of level edits, stored as small deltas.
+    
+    An entry is the list of primitive changes one action made, each a
+    (kind, added, payload) tuple: a platform rect or an Enemy that was added
+    or removed, or an (x, y, width) span of ground cells that was filled or
+    cleared. Ground is journaled as cell spans rather than runs, so the
+    merges and splits an edit caused are simply redone by the level when the
+    span is replayed. Undo and redo therefore cost O(changed cells), never
+    O(level size).
+    
+    Changes recorded between begin_stroke() and end_stroke() (e.g. one drag
+    of the ground brush) become a single entry. Once the entries take more
+    than memory_limit bytes, the oldest ones are dropped.
+    """
+    def __init__(self, apply_change, memory_limit):
+        self._apply_change = apply_change  # callback(kind, added, payload)
+        self.memory_limit = memory_limit
+        self._undo = deque()  # (changes, size), oldest first
+        self._redo = []
+        self._size = 0        # estimated bytes held by the undo entries
+        self._pending = []
+        self._pending_size = 0
+        self._depth = 0
+        self._stroke = False
+        self._replaying = False
+    
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._size = 0
+        self._pending = []
+        self._pending_size = 0
+    
+    def can_undo(self):
+        return bool(self._undo or self._pending)
+    
+    def can_redo(self):
+        return bool(self._redo)
+    
+    def record(self, kind, added, payload):
+        """Note one primitive change made by the current action"""
+        if self._replaying:
+            return
+        change = (kind, added, payload)
+        self._pending.append(change)
+        self._pending_size += sys.getsizeof(change) + sys.getsizeof(payload)
+        if self._depth == 0 and not self._stroke:
+            self._commit()
+    
+    @contextmanager
+    def action(self):
+        """Group every change made inside the block into one entry"""
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0 and not self._stroke:
+                self._commit()
+    
+    def begin_stroke(self):
+        """Start collecting changes until end_stroke() into one entry"""
+        self._commit()
+        self._stroke = True
+    
+    def end_stroke(self):
+        self._stroke = False
+        if self._depth == 0:
+            self._commit()
+    
+    def _commit(self):
+        if not self._pending:
+            return
+        self._undo.append((self._pending, self._pending_size))
+        self._size += self._pending_size
+        self._pending = []
+        self._pending_size = 0
+        self._redo.clear()
+        self._evict()
+    
+    def _evict(self):
+        """Drop the oldest entries until the history fits the memory limit"""
+        while self._size > self.memory_limit and len(self._undo) > 1:
+            _, size = self._undo.popleft()
+            self._size -= size
+    
+    def _replay(self, changes, forward):
+        self._replaying = True
+        try:
+            if forward:
+                for kind, added, payload in changes:
+                    self._apply_change(kind, added, payload)
+            else:
+                for kind, added, payload in reversed(changes):
+                    self._apply_change(kind, not added, payload)
+        finally:
+            self._replaying = False
+    
+    def undo(self):
+        """Revert the newest entry; returns False if there is nothing to undo"""
+        self._stroke = False
+        self._commit()
+        if not self._undo:
+            return False
+        entry = self._undo.pop()
+        self._size -= entry[1]
+        self._replay(entry[0], False)
+        self._redo.append(entry)
+        return True
+    
+    def redo(self):
+        """Re-apply the newest undone entry; returns False if there is nothing to redo"""
+        if not self._redo:
+            return False
+        entry = self._redo.pop()
+        self._replay(entry[0], True)
+        self._undo.append(entry)
+        self._size += entry[1]
+        self._evict()
+        return True
@@ -1,8 +1,204 @@
 import pygame
+import numpy as np
+from contextlib import contextmanager
 from editor.config import Config
+from editor.elements import Platform, GroundRun, Enemy
+from editor.occupancy import OccupancyGrid
+from editor.chunks import LevelChunk
+from editor.history import UndoJournal
+from editor.changes import LevelChange, DirtyRegions
+from editor.compaction import mesh_rects
+from editor.rescale import scale_rects, scale_cells, clip_rects
+from editor.tile_layers import TileLayer
+from editor.enemy_types import EnemyImages
+from editor.stats import LevelStats
 
-class Level:
-    def __init__(self):
+class LevelView:
+    """Read-only queries and serialization shared by Level and LevelSnapshot.
+    
+    Subclasses provide the dimensions, chunk_width, the _chunks mapping, the
+    tile_layers mapping and the asset/parallax attributes used by to_dict().
+    """
+    @property
+    def platforms(self):
+        platforms = []
+        for chunk in self._ordered_chunks():
+            platforms.extend(platform for platform in chunk.platforms.values() if chunk.owns(platform.x))
+        return platforms
+    
+    @property
+    def ground_blocks(self):
+        return self._join_ground(self._ordered_chunks())
+    
+    @property
+    def enemies(self):
+        enemies = []
+        for chunk in self._ordered_chunks():
+            enemies.extend(chunk.enemies)
+        return enemies
+    
+    def platforms_in_rect(self, x, y, width, height):
+        """Return the platforms overlapping a cell rectangle (e.g. the viewport)"""
+        found = {}
+        for chunk in self._chunks_in(x, width):
+            for platform_id in chunk.platform_index.query_rect(x, y, width, height):
+                found[platform_id] = chunk.platforms[platform_id]
+        return [found[platform_id] for platform_id in sorted(found)]
+    
+    def ground_in_rect(self, x, y, width, height):
+        """Return the ground runs overlapping a cell rectangle (e.g. the viewport)"""
+        chunks = self._chunks_in(x, width)
+        runs = self._join_ground(chunks, y, height)
+        return [run for run in runs if run.x < x + width and x < run.x + run.width]
+    
+    def enemies_in_rect(self, x, y, width, height):
+        """Return the enemies standing inside a cell rectangle (e.g. the viewport)"""
+        enemies = []
+        for chunk in self._chunks_in(x, width):
+            store = chunk.enemies
+            enemies.extend(store[enemy_id] for enemy_id in store.ids_in_rect(x, y, width, height))
+        return enemies
+    
+    def enemy_at(self, grid_x, grid_y):
+        """Return the most recently placed enemy on a cell, or None"""
+        chunk = self._chunks.get(grid_x // self.chunk_width)
+        if chunk is None:
+            return None
+        enemy_ids = chunk.enemies.ids_at(grid_x, grid_y)
+        if not enemy_ids:
+            return None
+        return chunk.enemies[enemy_ids[-1]]
+    
+    def copy_region(self, x, y, width, height):
+        """Return the contents of a cell rectangle as a pattern for stamp().
+        
+        A pattern uses the level file layout ('platforms', 'ground_blocks' and
+        'enemies' lists) with coordinates relative to the rectangle's corner.
+        Platforms are clipped to the rectangle.
+        """
+        platforms = []
+        for platform in self.platforms_in_rect(x, y, width, height):
+            left, top, clipped_width, clipped_height = self._clip_rect(platform.rect, (x, y, width, height))
+            platforms.append(Platform(left - x, top - y, clipped_width, clipped_height).to_dict())
+        ground = []
+        for run in self.ground_in_rect(x, y, width, height):
+            left = max(x, run.x)
+            right = min(x + width, run.x + run.width)
+            ground.append(GroundRun(left - x, run.y - y, right - left).to_dict())
+        enemies = []
+        for enemy in self.enemies_in_rect(x, y, width, height):
+            enemies.append(Enemy(enemy.x - x, enemy.y - y, enemy.type_id, enemy.direction, enemy.animation_frame).to_dict())
+        return {'platforms': platforms, 'ground_blocks': ground, 'enemies': enemies}
+    
+    def occupied(self, kind, x, y, width, height):
+        """Boolean (height, width) array of the cells of a rectangle holding an element of a kind"""
+        cells = np.zeros((max(0, height), max(0, width)), dtype=bool)
+        for chunk in self._chunks_in(x, width):
+            left = max(x, chunk.x)
+            right = min(x + width, chunk.x + chunk.width)
+            cells[:, left - x:right - x] = chunk.occupancy.covered(kind, left - chunk.x, y, right - left, height)
+        return cells
+    
+    def tile_at(self, layer_name, x, y):
+        """Tile id on a cell of a tile layer (TileLayer.EMPTY if none)"""
+        return self.tile_layers[layer_name].tile_at(x, y)
+    
+    def tiles_in_rect(self, layer_name, x, y, width, height):
+        """Return the (x, y, width, tile) runs of a tile layer inside a cell rectangle, clipped to it"""
+        return list(self.tile_layers[layer_name].runs_in_rect(x, y, width, height))
+    
+    def _chunk_indices(self, x, width=1):
+        """Indices of the chunks overlapped by columns [x, x + width)"""
+        return range(x // self.chunk_width, (x + max(1, width) - 1) // self.chunk_width + 1)
+    
+    def _chunks_in(self, x, width):
+        """Existing chunks overlapped by columns [x, x + width), left to right"""
+        indices = self._chunk_indices(x, width)
+        if len(indices) > len(self._chunks):
+            return [chunk for chunk in self._ordered_chunks() if chunk.index in indices]
+        return [self._chunks[index] for index in indices if index in self._chunks]
+    
+    def _ordered_chunks(self):
+        return [self._chunks[index] for index in sorted(self._chunks)]
+    
+    @staticmethod
+    def _clip_rect(rect, bounds):
+        """Intersection of two cell rectangles (width/height <= 0 when they miss)"""
+        x, y, width, height = rect
+        bx, by, bwidth, bheight = bounds
+        left = max(x, bx)
+        top = max(y, by)
+        return left, top, min(x + width, bx + bwidth) - left, min(y + height, by + bheight) - top
+    
+    @staticmethod
+    def _join_ground(chunks, y=None, height=None):
+        """Join the per-chunk ground pieces that continue across chunk boundaries"""
+        rows = {}  # y -> [GroundRun]
+        for chunk in chunks:
+            for ground_id in chunk.ground_rows.ids():
+                piece = chunk.ground[ground_id]
+                if y is not None and not y <= piece.y < y + height:
+                    continue
+                runs = rows.setdefault(piece.y, [])
+                if runs and runs[-1].x + runs[-1].width == piece.x:
+                    runs[-1].width += piece.width
+                else:
+                    runs.append(GroundRun(piece.x, piece.y, piece.width))
+        return [run for row in sorted(rows) for run in rows[row]]
+    
+    def to_dict(self):
+        """Convert level data to a dictionary"""
+        # Function to convert absolute paths to relative paths
+        def make_relative_path(path):
+            if not path:
+                return None
+                
+            # Convert backslashes to forward slashes for consistency
+            path = path.replace("\\", "/")
+            
+            # Extract the relative path starting from "resources"
+            if "resources" in path:
+                # Find the index of "resources" in the path
+                resources_index = path.find("resources")
+                if resources_index != -1:
+                    return path[resources_index:]
+            
+            # If we can't find "resources" in the path, return the original path
+            return path
+            
+        # Create level dictionary following the design spec structure
+        level_data = {
+            'dimensions': {
+                'width': self.width,
+                'height': self.height,
+                'cell_size': self.cell_size,
+                'width_pixels': self.width_pixels,
+                'height_pixels': self.height_pixels
+            },
+            'platforms': [platform.to_dict() for platform in self.platforms],
+            'ground_blocks': [ground.to_dict() for ground in self.ground_blocks],
+            'enemies': [enemy for chunk in self._ordered_chunks() for enemy in chunk.enemies.to_dicts()],
+            'assets': {
+                'background': make_relative_path(self.bg_path) if hasattr(self, 'bg_path') else None,
+                'foreground': make_relative_path(self.fg_path) if hasattr(self, 'fg_path') else None,
+                'platform_image': 'resources/graphics/platform.png',
+                'enemy_types': list(self.enemy_images.keys()) if hasattr(self, 'enemy_images') else []
+            },
+            'parallax': {
+                'fg_scroll_rate': getattr(self, 'fg_scroll_rate', 1.0),
+                'bg_scroll_rate': getattr(self, 'bg_scroll_rate', 0.2),
+            },
+            'metadata': {
+                'created': pygame.time.get_ticks(),
+                'editor_version': '1.0'
+            }
+        }
+        if self.tile_layers:
+            level_data['tile_layers'] = [layer.to_dict() for layer in self.tile_layers.values()]
+        return level_data
+
+class Level(LevelView):
+    def __init__(self, columnar_enemies=None):
         # Level dimensions
         self.cell_size = Config.DEFAULT_CELL_SIZE
         self.width = Config.DEFAULT_LEVEL_WIDTH
@@ -12,16 +208,51 @@ class Level:
         self.width_pixels = self.width * self.cell_size
         self.height_pixels = self.height * self.cell_size
         
-        # Level elements
-        self.platforms = []
-        self.ground_blocks = []
-        self.enemies = []
+        # Change feed: listeners get a LevelChange for every mutation, and the
+        # changed cells pile up in dirty_regions until a consumer drains them
+        self.listeners = []
+        self.dirty_regions = DirtyRegions(Config.DIRTY_TILE_SIZE)
+        self._batched_rects = None  # collects change rects during a bulk edit
+        
+        # Level elements live in fixed-width column chunks that are created
+        # on first use and dropped again once empty, so memory and edit cost
+        # follow the touched columns rather than the level width
+        self.chunk_width = Config.CHUNK_WIDTH
+        self._chunks = {}  # chunk index -> LevelChunk
+        self._next_id = 0
+        
+        # Element counts, updated by every mutation instead of recounted
+        self.stats = LevelStats()
+        
+        # Snapshots share the chunk mapping and the chunks themselves; both
+        # are copied on the first write after a snapshot (see snapshot())
+        self._generation = 0
+        self._chunks_shared = False
+        self._deferring_marks = False  # see _deferred_marks()
+        
+        # Named tile layers beyond the fixed element kinds, in drawing order.
+        # They are shared with snapshots the same way as the chunks
+        self.tile_layers = {}  # name -> TileLayer
+        self._layers_shared = False
+        
+        # Enemies can be kept in NumPy columns instead of objects, which
+        # trades a little per-access cost for a few bytes per enemy
+        if columnar_enemies is None:
+            columnar_enemies = Config.COLUMNAR_ENEMIES
+        self.columnar_enemies = columnar_enemies
+        
+        # Whether placing an enemy on an occupied cell replaces the enemy
+        # already standing there
+        self.one_enemy_per_cell = Config.ONE_ENEMY_PER_CELL
+        
+        # Undo/redo history of element edits
+        self.history = UndoJournal(self._apply_change, Config.UNDO_MEMORY_LIMIT)
         
         # Asset placeholders
         self.background = None
         self.foreground = None
         self.platform_image = None
-        self.enemy_images = {}
+        self.enemy_images = EnemyImages()  # type name -> sprite, also indexable by type id
         
         # Paths to background and foreground images
         self.bg_path = None
@@ -31,62 +262,170 @@ class Level:
         self.fg_scroll_rate = 1.0  # Foreground is always 1.0
         self.bg_scroll_rate = 0.2  # Default background scroll rate
     
-    def resize(self, width, height):
-        """Resize the level"""
-        self.width = max(1, width)
-        self.height = max(1, height)
+    def resize(self, width, height, extend_ground=None):
+        """Resize the level, cutting back or dropping what ends up outside it.
+        
+        Platforms and ground runs crossing a new edge are clipped to it and
+        elements entirely outside are removed. Chunks past the new right edge
+        are dropped whole, so only the edge chunk and the rows below a new
+        bottom are visited. When the level grows wider, ground rows reaching
+        the old right edge are extended to the new one
+        (Config.EXTEND_GROUND_ON_RESIZE). Returns the enemies that were
+        dropped. Shrinking clears the undo history, since journaled edits
+        may lie outside the new bounds.
+        """
+        width = max(1, width)
+        height = max(1, height)
+        if extend_ground is None:
+            extend_ground = Config.EXTEND_GROUND_ON_RESIZE
+        old_width, old_height = self.width, self.height
+        
+        dropped = []
+        with self._bulk_edit():
+            if width < old_width:
+                self._crop_columns(width, dropped)
+            if height < old_height:
+                self._crop_rows(height, old_height, dropped)
+            if width < old_width or height < old_height:
+                for name in list(self.tile_layers):
+                    if self._layer(name).crop(width, height):
+                        self._notify(LevelChange.ELEMENT_REMOVED, TileLayer.KIND, 0, 0, old_width, old_height)
+        if width < old_width or height < old_height:
+            self.history.clear()
+        
+        self.width = width
+        self.height = height
         self.width_pixels = self.width * self.cell_size
         self.height_pixels = self.height * self.cell_size
+        if height != old_height:
+            self._rebuild_occupancy()
+        
+        if extend_ground and width > old_width:
+            edge = self._chunks.get((old_width - 1) // self.chunk_width)
+            if edge is not None:
+                rows = [y for y in range(min(old_height, height)) if edge.ground_rows.find(old_width - 1, y) is not None]
+                with self._bulk_edit():
+                    for y in rows:
+                        self._fill_ground(old_width, y, width - old_width)
+        self._notify_level(LevelChange.LEVEL_RESIZED)
+        return dropped
     
     def set_cell_size(self, size):
-        """Update cell size and recalculate dimensions"""
+        """Update cell size and recalculate dimensions (elements keep their cell coordinates)"""
         self.cell_size = size
         self.width_pixels = self.width * self.cell_size
         self.height_pixels = self.height * self.cell_size
+        self._notify_level(LevelChange.CELL_SIZE_CHANGED)
+    
+    def rescale(self, cell_size):
+        """Change the cell size and move every element onto the new grid.
+        
+        The level keeps its pixel size and each element keeps its pixels:
+        platforms and ground cover the new cells under their old area (ground
+        rows falling into one coarser row merge), enemies move to the cell
+        holding their bottom-centre anchor. The level is rounded up to whole
+        new cells and anything past its new edges is cut off. Returns the
+        elements that could not be mapped exactly as (kind, old rect, new
+        rect) tuples, with a new rect of None for ones cut off entirely. The
+        undo history is cleared since it is kept in cell coordinates.
+        """
+        old_size = self.cell_size
+        if cell_size <= 0 or cell_size == old_size:
+            return []
+        width = max(1, -(-self.width_pixels // cell_size))
+        height = max(1, -(-self.height_pixels // cell_size))
+        
+        platforms = self.platforms
+        ground = self.ground_blocks
+        enemies = self.enemies
+        platform_rects, platforms_exact = scale_rects([platform.rect for platform in platforms], old_size, cell_size)
+        ground_rects, ground_exact = scale_rects([run.rect for run in ground], old_size, cell_size)
+        enemy_cells, enemies_exact = scale_cells([(enemy.x, enemy.y) for enemy in enemies], old_size, cell_size)
+        layer_runs = {name: [(x, y, width, 1, tile) for x, y, width, tile in layer.runs_in_rect(0, 0, self.width, self.height)]
+                      for name, layer in self.tile_layers.items()}
+        
+        # Ground merged into a coarser row is still exact when old ground
+        # covers every new cell it ends up on
+        for i in (~ground_exact).nonzero()[0].tolist():
+            ground_exact[i] = self._covers_ground((ground_rects[i] * cell_size).tolist())
+        
+        # Cut everything back to the new bounds
+        platform_rects, inside = clip_rects(platform_rects, width, height)
+        platforms_exact &= inside
+        ground_rects, inside = clip_rects(ground_rects, width, height)
+        ground_exact &= inside
+        enemies_inside = ((enemy_cells >= 0) & (enemy_cells < (width, height))).all(axis=1)
+        enemies_exact &= enemies_inside
+        enemy_rects = np.concatenate((enemy_cells, np.where(enemies_inside, 1, 0)[:, None].repeat(2, axis=1)), axis=1)
+        
+        lossy = []
+        for kind, elements, scaled, exact in (
+            (OccupancyGrid.PLATFORM, platforms, platform_rects, platforms_exact),
+            (OccupancyGrid.GROUND, ground, ground_rects, ground_exact),
+            (OccupancyGrid.ENEMY, enemies, enemy_rects, enemies_exact)
+        ):
+            for i in (~exact).nonzero()[0].tolist():
+                lossy.append((kind, elements[i].rect, self._scaled_rect(scaled[i])))
+        layer_rects = {}
+        for name, runs in layer_runs.items():
+            scaled, exact = scale_rects([run[:4] for run in runs], old_size, cell_size)
+            scaled, inside = clip_rects(scaled, width, height)
+            layer_rects[name] = scaled.tolist()
+            lossy.extend((TileLayer.KIND, runs[i][:4], self._scaled_rect(scaled[i])) for i in (~(exact & inside)).nonzero()[0].tolist())
+        
+        # Rebuild the chunks on the new grid
+        self.cell_size = cell_size
+        self.width = width
+        self.height = height
+        self.width_pixels = width * cell_size
+        self.height_pixels = height * cell_size
+        self._chunks = {}
+        self._chunks_shared = False
+        self.stats.reset()
+        self.history.clear()
+        with self._bulk_edit(), self._deferred_marks():
+            for rect in platform_rects.tolist():
+                if rect[2] and rect[3]:
+                    self._place_platform(Platform(*rect))
+            for x, y, span in self._merge_spans(ground_rects.tolist()):
+                if span:
+                    self._fill_ground(x, y, span)
+            for enemy, (x, y), inside in zip(enemies, enemy_cells.tolist(), enemies_inside.tolist()):
+                if inside:
+                    self._chunk(x // self.chunk_width).add_enemy(Enemy(x, y, enemy.type_id, enemy.direction, enemy.animation_frame))
+        # Tile runs merged into one coarser cell keep the tile painted last
+        layers = {}
+        for name, layer in self.tile_layers.items():
+            layers[name] = TileLayer(name, layer.solid)
+            layers[name].generation = self._generation
+            for (x, y, run_width, run_height), run in zip(layer_rects[name], layer_runs[name]):
+                for row in range(y, y + run_height):
+                    layers[name].fill(x, row, run_width, run[4])
+        self.tile_layers = layers
+        self._layers_shared = False
+        self._notify_level(LevelChange.CELL_SIZE_CHANGED)
+        return lossy
     
     def add_platform(self, x, y, width, height):
         """Add a platform to the level"""
-        platform = {
-            'x': x,
-            'y': y,
-            'width': width,
-            'height': height
-        }
-        self.platforms.append(platform)
+        self._place_platform(Platform(x, y, width, height))
+        self.history.record(OccupancyGrid.PLATFORM, True, (x, y, width, height))
     
     def add_ground(self, x, y, width=1):
         """Add a ground block to the level"""
-        # Check if we can merge with an adjacent ground block
-        for i, ground in enumerate(self.ground_blocks):
-            if ground['y'] == y:  # Same row
-                # Check if adjacent to the right
-                if ground['x'] + ground['width'] == x:
-                    self.ground_blocks[i]['width'] += width
-                    return
-                # Check if adjacent to the left
-                elif x + width == ground['x']:
-                    self.ground_blocks[i]['x'] = x
-                    self.ground_blocks[i]['width'] += width
-                    return
-        
-        # If no merge happened, add a new ground block
-        ground = {
-            'x': x,
-            'y': y,
-            'width': width
-        }
-        self.ground_blocks.append(ground)
+        if width <= 0:
+            return
+        
+        # Journal only the cells that were not ground yet
+        with self.history.action():
+            for span_x, span_width in self._fill_ground(x, y, width):
+                self.history.record(OccupancyGrid.GROUND, True, (span_x, y, span_width))
     
     def add_enemy(self, x, y, enemy_type="armadillo_warrior"):
         """Add an enemy to the level"""
-        enemy = {
-            'x': x,
-            'y': y,
-            'type': enemy_type,
-            'direction': 'south',  # Default direction
-            'animation_frame': 3   # 4th frame (0-indexed) from 3rd row
-        }
-        self.enemies.append(enemy)
+        # Enemies face south, 4th frame (0-indexed) from 3rd row by default
+        with self.history.action():
+            self._put_enemy(Enemy(x, y, enemy_type))
         
         # Make sure to load the enemy image if it's not already loaded
         if enemy_type not in self.enemy_images:
@@ -128,112 +467,576 @@ class Level:
     
     def delete_at(self, grid_x, grid_y):
         """Delete any elements at the given grid position"""
-        # Check and delete platforms
-        platforms_to_remove = []
-        for i, platform in enumerate(self.platforms):
-            if (platform['x'] <= grid_x < platform['x'] + platform['width'] and
-                platform['y'] <= grid_y < platform['y'] + platform['height']):
-                platforms_to_remove.append(i)
-        
-        # Remove platforms (in reverse order to avoid index issues)
-        for i in sorted(platforms_to_remove, reverse=True):
-            self.platforms.pop(i)
-        
-        # Check and delete ground blocks
-        grounds_to_remove = []
-        for i, ground in enumerate(self.ground_blocks):
-            if (ground['x'] <= grid_x < ground['x'] + ground['width'] and
-                ground['y'] == grid_y):
-                # Split the ground block if deleting from middle
-                if ground['x'] < grid_x and grid_x < ground['x'] + ground['width'] - 1:
-                    # Create new block for right side
-                    right_width = ground['x'] + ground['width'] - grid_x - 1
-                    if right_width > 0:
-                        self.ground_blocks.append({
-                            'x': grid_x + 1,
-                            'y': ground['y'],
-                            'width': right_width
-                        })
-                    
-                    # Resize the original to exclude the deleted cell
-                    self.ground_blocks[i]['width'] = grid_x - ground['x']
-                    
-                    # Skip the removal if we've handled it by resizing
-                    if self.ground_blocks[i]['width'] > 0:
-                        continue
-                
-                grounds_to_remove.append(i)
+        chunk = self._chunks.get(grid_x // self.chunk_width)
+        if chunk is None:
+            return False
+        if 0 <= grid_y < self.height:
+            # Fast path: nothing at all on this cell
+            if not chunk.kinds_at(grid_x, grid_y):
+                return False
         
-        # Remove ground blocks (in reverse order)
-        for i in sorted(grounds_to_remove, reverse=True):
-            self.ground_blocks.pop(i)
+        chunk = self._own(chunk)
+        with self.history.action():
+            # Check and delete platforms (a platform may span several chunks)
+            platforms_to_remove = chunk.platform_index.query_point(grid_x, grid_y)
+            for platform_id in platforms_to_remove:
+                platform = chunk.platforms[platform_id]
+                self._remove_platform(platform, platform_id)
+                self.history.record(OccupancyGrid.PLATFORM, False, platform.rect)
+            
+            # Check and delete ground blocks
+            ground_id = chunk.ground_rows.find(grid_x, grid_y)
+            grounds_to_remove = ground_id is not None
+            if grounds_to_remove:
+                chunk.cut_ground(ground_id, grid_x)
+                self.history.record(OccupancyGrid.GROUND, False, (grid_x, grid_y, 1))
+            
+            # Check and delete enemies
+            enemies_to_remove = chunk.enemies.ids_at(grid_x, grid_y)
+            for enemy_id in enemies_to_remove:
+                self.history.record(OccupancyGrid.ENEMY, False, chunk.remove_enemy(enemy_id))
         
-        # Check and delete enemies
-        enemies_to_remove = []
-        for i, enemy in enumerate(self.enemies):
-            if enemy['x'] == grid_x and enemy['y'] == grid_y:
-                enemies_to_remove.append(i)
+        self._drop_if_empty(chunk)
+        return bool(platforms_to_remove or grounds_to_remove or enemies_to_remove)
+    
+    def compact(self):
+        """Re-mesh the platforms into a small set of maximal rectangles.
         
-        # Remove enemies (in reverse order)
-        for i in sorted(enemies_to_remove, reverse=True):
-            self.enemies.pop(i)
+        The union of all platform cells is greedily meshed and replaces the
+        platforms as drawn whenever that gives fewer rectangles. Ground runs
+        are already maximal per row and the file format has no ground height,
+        so they are left as they are. Undoable as a single edit; returns the
+        platform count before and after.
+        """
+        owned = []
+        for chunk in self._ordered_chunks():
+            owned.extend((platform_id, platform) for platform_id, platform in chunk.platforms.items()
+                         if chunk.owns(platform.x))
+        rects = mesh_rects([platform.rect for _, platform in owned])
+        if len(rects) >= len(owned):
+            return len(owned), len(owned)
         
-        return bool(platforms_to_remove or grounds_to_remove or enemies_to_remove)
+        with self.history.action():
+            for platform_id, platform in owned:
+                self._remove_platform(platform, platform_id)
+                self.history.record(OccupancyGrid.PLATFORM, False, platform.rect)
+            for rect in rects:
+                self._place_platform(Platform(*rect))
+                self.history.record(OccupancyGrid.PLATFORM, True, rect)
+        return len(owned), len(rects)
+    
+    def fill_rect(self, x, y, width, height, element="ground"):
+        """Fill a cell rectangle with ground, or cover it with one platform (clipped to the level)"""
+        x, y, width, height = self._clip_rect((x, y, width, height), (0, 0, self.width, self.height))
+        if width <= 0 or height <= 0:
+            return
+        with self._bulk_edit():
+            if element == "platform":
+                self._place_platform(Platform(x, y, width, height))
+                self.history.record(OccupancyGrid.PLATFORM, True, (x, y, width, height))
+                return
+            for row in range(y, y + height):
+                for span_x, span_width in self._fill_ground(x, row, width):
+                    self.history.record(OccupancyGrid.GROUND, True, (span_x, row, span_width))
+    
+    def add_ground_cells(self, cells):
+        """Make a batch of (x, y) cells ground as one edit (e.g. a frame of a brush stroke)"""
+        with self._bulk_edit():
+            for x, y, width in self._cell_spans(cells):
+                for span_x, span_width in self._fill_ground(x, y, width):
+                    self.history.record(OccupancyGrid.GROUND, True, (span_x, y, span_width))
+    
+    def delete_cells(self, cells):
+        """delete_at() every (x, y) cell of a batch as one edit; returns True if anything was removed"""
+        removed = False
+        with self._bulk_edit():
+            for x, y in dict.fromkeys(cells):
+                removed = self.delete_at(x, y) or removed
+        return removed
+    
+    def erase_rect(self, x, y, width, height):
+        """Remove everything inside a cell rectangle.
+        
+        Platforms sticking out of the rectangle are cut back to the part
+        outside it. Returns True if anything was removed.
+        """
+        if width <= 0 or height <= 0:
+            return False
+        with self._bulk_edit():
+            platforms, ground, enemies = self._take_region(x, y, width, height)
+        return bool(platforms or ground or enemies)
+    
+    def move_region(self, x, y, width, height, dx, dy):
+        """Move everything inside a cell rectangle by (dx, dy) cells.
+        
+        The moved contents are added on top of whatever is at the target;
+        anything ending up outside the level is dropped.
+        """
+        if width <= 0 or height <= 0 or (dx == 0 and dy == 0):
+            return
+        with self._bulk_edit():
+            platforms, ground, enemies = self._take_region(x, y, width, height)
+            self._paste(platforms, ground, enemies, dx, dy)
+    
+    def stamp(self, pattern, x, y):
+        """Add a pattern (see copy_region) with its corner at cell (x, y)"""
+        platforms = [Platform.from_dict(platform).rect for platform in pattern.get('platforms', [])]
+        ground = [GroundRun.from_dict(ground).rect[:3] for ground in pattern.get('ground_blocks', [])]
+        enemies = [Enemy.from_dict(enemy) for enemy in pattern.get('enemies', [])]
+        with self._bulk_edit():
+            self._paste(platforms, ground, enemies, x, y)
+    
+    def add_tile_layer(self, name, solid=False):
+        """Add an empty tile layer drawn above the existing ones; returns False if the name is taken"""
+        if name in self.tile_layers:
+            return False
+        layer = TileLayer(name, solid)
+        layer.generation = self._generation
+        self._own_layers()
+        self.tile_layers[name] = layer
+        return True
+    
+    def remove_tile_layer(self, name):
+        """Remove a tile layer and its tiles; the undo history is cleared, as it may refer to the layer"""
+        layer = self.tile_layers.get(name)
+        if layer is None:
+            return False
+        self._own_layers()
+        del self.tile_layers[name]
+        self.history.clear()
+        if not layer.is_empty():
+            self._notify_level(LevelChange.ELEMENT_REMOVED)
+        return True
+    
+    def fill_tiles(self, layer_name, x, y, width, height, tile):
+        """Paint a cell rectangle of a tile layer with one tile id (TileLayer.EMPTY erases)"""
+        if width <= 0 or height <= 0:
+            return
+        layer = self._layer(layer_name)
+        change_type = LevelChange.ELEMENT_REMOVED if tile == TileLayer.EMPTY else LevelChange.ELEMENT_ADDED
+        with self._bulk_edit():
+            for row in range(y, y + height):
+                previous = layer.fill(x, row, width, tile)
+                self.history.record(TileLayer.KIND, True, (layer_name, x, row, width, tile, tuple(previous)))
+            self._notify(change_type, TileLayer.KIND, x, y, width, height)
+    
+    def set_tile(self, layer_name, x, y, tile):
+        """Set one cell of a tile layer"""
+        self.fill_tiles(layer_name, x, y, 1, 1, tile)
+    
+    def snapshot(self):
+        """Return an immutable LevelSnapshot of the current level in O(1).
+        
+        The snapshot shares every chunk with the level. The next edit of a
+        chunk copies that chunk first, so later edits never show through and
+        only the chunks touched after the snapshot are ever duplicated. A
+        snapshot can be read from another thread while editing continues.
+        """
+        self._generation += 1
+        self._chunks_shared = True
+        self._layers_shared = True
+        return LevelSnapshot(self)
+    
+    def undo(self):
+        """Revert the last edit (or drag stroke); returns False if there is none"""
+        return self.history.undo()
+    
+    def redo(self):
+        """Re-apply the last undone edit; returns False if there is none"""
+        return self.history.redo()
     
     def clear(self):
         """Clear all level elements"""
-        self.platforms = []
-        self.ground_blocks = []
-        self.enemies = []
+        self._chunks = {}
+        self._chunks_shared = False
+        self.stats.reset()
+        self.tile_layers = {}
+        self._layers_shared = False
+        self.history.clear()
+        self._notify_level(LevelChange.ELEMENT_REMOVED)
     
-    def to_dict(self):
-        """Convert level data to a dictionary"""
-        # Function to convert absolute paths to relative paths
-        def make_relative_path(path):
-            if not path:
-                return None
-                
-            # Convert backslashes to forward slashes for consistency
-            path = path.replace("\\", "/")
-            
-            # Extract the relative path starting from "resources"
-            if "resources" in path:
-                # Find the index of "resources" in the path
-                resources_index = path.find("resources")
-                if resources_index != -1:
-                    return path[resources_index:]
-            
-            # If we can't find "resources" in the path, return the original path
-            return path
-            
-        # Create level dictionary following the design spec structure
-        level_data = {
-            'dimensions': {
-                'width': self.width,
-                'height': self.height,
-                'cell_size': self.cell_size,
-                'width_pixels': self.width_pixels,
-                'height_pixels': self.height_pixels
-            },
-            'platforms': self.platforms,
-            'ground_blocks': self.ground_blocks,
-            'enemies': self.enemies,
-            'assets': {
-                'background': make_relative_path(self.bg_path) if hasattr(self, 'bg_path') else None,
-                'foreground': make_relative_path(self.fg_path) if hasattr(self, 'fg_path') else None,
-                'platform_image': 'resources/graphics/platform.png',
-                'enemy_types': list(self.enemy_images.keys()) if hasattr(self, 'enemy_images') else []
-            },
-            'parallax': {
-                'fg_scroll_rate': getattr(self, 'fg_scroll_rate', 1.0),
-                'bg_scroll_rate': getattr(self, 'bg_scroll_rate', 0.2),
-            },
-            'metadata': {
-                'created': pygame.time.get_ticks(),
-                'editor_version': '1.0'
-            }
-        }
-        return level_data
+    def add_listener(self, listener):
+        """Call listener(change) with a LevelChange after every mutation"""
+        self.listeners.append(listener)
+    
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+    
+    def _notify(self, change_type, kind, x, y, width=1, height=1):
+        self.dirty_regions.add(x, y, width, height)
+        if self._batched_rects is not None:
+            self._batched_rects.append((x, y, width, height))
+        elif self.listeners:
+            change = LevelChange(change_type, kind, (x, y, width, height))
+            for listener in list(self.listeners):
+                listener(change)
+    
+    def _notify_level(self, change_type):
+        """Report a change affecting the whole level"""
+        self.dirty_regions.add_all(self.width, self.height)
+        if self.listeners:
+            change = LevelChange(change_type, None, (0, 0, self.width, self.height))
+            for listener in list(self.listeners):
+                listener(change)
+    
+    @contextmanager
+    def _bulk_edit(self):
+        """Group a bulk operation into one undo entry and one REGION_CHANGED event"""
+        if self._batched_rects is not None:
+            yield
+            return
+        self._batched_rects = []
+        try:
+            with self.history.action():
+                yield
+        finally:
+            rects = self._batched_rects
+            self._batched_rects = None
+            if rects and self.listeners:
+                left = min(x for x, _, _, _ in rects)
+                top = min(y for _, y, _, _ in rects)
+                right = max(x + width for x, _, width, _ in rects)
+                bottom = max(y + height for _, y, _, height in rects)
+                change = LevelChange(LevelChange.REGION_CHANGED, None, (left, top, right - left, bottom - top))
+                for listener in list(self.listeners):
+                    listener(change)
+    
+    @contextmanager
+    def _deferred_marks(self):
+        """Fill the cell lookup of chunks created inside the block in one vectorized pass each (bulk loads)"""
+        self._deferring_marks = True
+        try:
+            yield
+        finally:
+            self._deferring_marks = False
+            for chunk in self._chunks.values():
+                chunk.occupancy.end_batch()
+    
+    def _new_id(self):
+        element_id = self._next_id
+        self._next_id += 1
+        return element_id
+    
+    def _chunk(self, index):
+        """Return the chunk with the given index for editing, creating it if needed"""
+        chunk = self._chunks.get(index)
+        if chunk is None:
+            chunk = LevelChunk(index, self.chunk_width, self.height, self._new_id, self._notify,
+                               self.columnar_enemies, self.stats)
+            chunk.generation = self._generation
+            if self._deferring_marks:
+                chunk.occupancy.begin_batch()
+            self._own_mapping()
+            self._chunks[index] = chunk
+            return chunk
+        return self._own(chunk)
+    
+    def _own(self, chunk):
+        """Return a chunk safe to edit, copying it first if a snapshot shares it"""
+        if chunk.generation == self._generation:
+            return chunk
+        chunk = chunk.copy(self._generation)
+        self._own_mapping()
+        self._chunks[chunk.index] = chunk
+        return chunk
+    
+    def _own_mapping(self):
+        """Copy the chunk mapping before changing it if a snapshot shares it"""
+        if self._chunks_shared:
+            self._chunks = dict(self._chunks)
+            self._chunks_shared = False
+    
+    def _layer(self, name):
+        """Return a tile layer safe to edit, copying it first if a snapshot shares it"""
+        layer = self.tile_layers[name]
+        if layer.generation == self._generation:
+            return layer
+        layer = layer.copy(self._generation)
+        self._own_layers()
+        self.tile_layers[name] = layer
+        return layer
+    
+    def _own_layers(self):
+        """Copy the tile layer mapping before changing it if a snapshot shares it"""
+        if self._layers_shared:
+            self.tile_layers = dict(self.tile_layers)
+            self._layers_shared = False
+    
+    def _drop_if_empty(self, chunk):
+        if chunk.is_empty() and self._chunks.get(chunk.index) is chunk:
+            self._own_mapping()
+            del self._chunks[chunk.index]
+    
+    def _place_platform(self, platform):
+        """Register a platform in every chunk it spans"""
+        platform_id = self._new_id()
+        for index in self._chunk_indices(platform.x, platform.width):
+            self._chunk(index).add_platform(platform_id, platform)
+        self.stats.platforms += 1
+        self._notify(LevelChange.ELEMENT_ADDED, OccupancyGrid.PLATFORM, *platform.rect)
+    
+    def _remove_platform(self, platform, platform_id):
+        """Remove a platform from every chunk it spans"""
+        for index in self._chunk_indices(platform.x, platform.width):
+            chunk = self._chunks.get(index)
+            if chunk is None:
+                continue  # already dropped by a crop
+            chunk = self._own(chunk)
+            chunk.remove_platform(platform_id)
+            self._drop_if_empty(chunk)
+        self.stats.platforms -= 1
+        self._notify(LevelChange.ELEMENT_REMOVED, OccupancyGrid.PLATFORM, *platform.rect)
+    
+    def _clip_platforms(self, platforms, right, bottom):
+        """Cut (id, Platform) pairs back to columns < right and rows < bottom, removing those left empty"""
+        for platform_id, platform in platforms:
+            self._remove_platform(platform, platform_id)
+            x, y, width, height = platform.rect
+            width = min(width, right - x)
+            height = min(height, bottom - y)
+            if width > 0 and height > 0:
+                self._place_platform(Platform(x, y, width, height))
+    
+    def _crop_columns(self, width, dropped):
+        """Remove everything at columns >= width, adding the removed enemies to dropped"""
+        # Chunks entirely past the edge go as a whole
+        beyond = [index for index in self._chunks if index * self.chunk_width >= width]
+        if beyond:
+            self._own_mapping()
+        for index in beyond:
+            chunk = self._chunks.pop(index)
+            self._forget_counts(chunk)
+            dropped.extend(chunk.enemies)
+        
+        # The chunk holding the last column has everything still crossing the edge
+        edge = self._chunks.get((width - 1) // self.chunk_width)
+        if edge is None:
+            return
+        edge = self._own(edge)
+        crossing = sorted((platform_id, platform) for platform_id, platform in edge.platforms.items()
+                          if platform.x + platform.width > width)
+        self._clip_platforms(crossing, width, float('inf'))
+        edge_end = edge.x + edge.width
+        if edge_end > width:
+            for y in range(self.height):
+                edge.erase_ground(width, y, edge_end - width)
+            for enemy_id in edge.enemies.ids_in_rect(width, 0, edge_end - width, self.height):
+                dropped.append(edge.remove_enemy(enemy_id))
+        self._drop_if_empty(edge)
+    
+    def _forget_counts(self, chunk):
+        """Take a chunk dropped as a whole out of the stats"""
+        self.stats.platforms -= sum(1 for platform in chunk.platforms.values() if chunk.owns(platform.x))
+        for kind, cells in enumerate(chunk.occupancy.covered_cells):
+            self.stats.covered(kind, -cells)
+        for enemy in chunk.enemies:
+            self.stats.enemy_changed(enemy.type_id, -1)
+    
+    def _crop_rows(self, height, old_height, dropped):
+        """Remove everything at rows >= height, adding the removed enemies to dropped"""
+        crossing = {}
+        for chunk in list(self._chunks.values()):
+            for platform_id in chunk.platform_index.query_rect(chunk.x, height, chunk.width, old_height - height):
+                crossing[platform_id] = chunk.platforms[platform_id]
+            enemy_ids = chunk.enemies.ids_in_rect(chunk.x, height, chunk.width, old_height - height)
+            ground_rows = [y for y in range(height, old_height) if chunk.ground_rows.touching(chunk.x, y, chunk.width)]
+            if not (enemy_ids or ground_rows):
+                continue
+            chunk = self._own(chunk)
+            for enemy_id in enemy_ids:
+                dropped.append(chunk.remove_enemy(enemy_id))
+            for y in ground_rows:
+                chunk.erase_ground(chunk.x, y, chunk.width)
+            self._drop_if_empty(chunk)
+        self._clip_platforms(sorted(crossing.items()), float('inf'), height)
+    
+    def _put_enemy(self, enemy):
+        """Place and journal an enemy, replacing others on the cell if required"""
+        chunk = self._chunk(enemy.x // self.chunk_width)
+        if self.one_enemy_per_cell:
+            for enemy_id in chunk.enemies.ids_at(enemy.x, enemy.y):
+                self.history.record(OccupancyGrid.ENEMY, False, chunk.remove_enemy(enemy_id))
+        chunk.add_enemy(enemy)
+        self.history.record(OccupancyGrid.ENEMY, True, enemy)
+    
+    def _take_region(self, x, y, width, height):
+        """Remove and journal everything inside a cell rectangle.
+        
+        Returns what was taken: platform rects clipped to the region, ground
+        (x, y, width) spans and Enemy objects, all in level coordinates.
+        """
+        region = (x, y, width, height)
+        
+        # Platforms: take the inside part, put back the parts sticking out
+        overlapping = {}
+        for chunk in self._chunks_in(x, width):
+            for platform_id in chunk.platform_index.query_rect(x, y, width, height):
+                overlapping[platform_id] = chunk.platforms[platform_id]
+        platforms = []
+        for platform_id in sorted(overlapping):
+            platform = overlapping[platform_id]
+            px, py, pwidth, pheight = platform.rect
+            self._remove_platform(platform, platform_id)
+            self.history.record(OccupancyGrid.PLATFORM, False, platform.rect)
+            inside = self._clip_rect(platform.rect, region)
+            platforms.append(inside)
+            left, top, inside_width, inside_height = inside
+            outside = [
+                (px, py, pwidth, top - py),                                          # above
+                (px, top + inside_height, pwidth, py + pheight - top - inside_height),  # below
+                (px, top, left - px, inside_height),                                 # left
+                (left + inside_width, top, px + pwidth - left - inside_width, inside_height)  # right
+            ]
+            for rect in outside:
+                if rect[2] > 0 and rect[3] > 0:
+                    self._place_platform(Platform(*rect))
+                    self.history.record(OccupancyGrid.PLATFORM, True, rect)
+        
+        # Ground, one row at a time
+        ground = []
+        for row in range(y, y + height):
+            for span_x, span_width in self._erase_ground(x, row, width):
+                self.history.record(OccupancyGrid.GROUND, False, (span_x, row, span_width))
+                ground.append((span_x, row, span_width))
+        
+        # Enemies
+        enemies = []
+        for chunk in self._chunks_in(x, width):
+            chunk = self._own(chunk)
+            for enemy_id in chunk.enemies.ids_in_rect(x, y, width, height):
+                enemy = chunk.remove_enemy(enemy_id)
+                self.history.record(OccupancyGrid.ENEMY, False, enemy)
+                enemies.append(enemy)
+            self._drop_if_empty(chunk)
+        return platforms, ground, enemies
+    
+    def _paste(self, platforms, ground, enemies, dx, dy):
+        """Add and journal elements shifted by (dx, dy), dropping what falls outside the level"""
+        bounds = (0, 0, self.width, self.height)
+        for x, y, width, height in platforms:
+            rect = self._clip_rect((x + dx, y + dy, width, height), bounds)
+            if rect[2] > 0 and rect[3] > 0:
+                self._place_platform(Platform(*rect))
+                self.history.record(OccupancyGrid.PLATFORM, True, rect)
+        for x, y, width in ground:
+            left, row, span_width, rows = self._clip_rect((x + dx, y + dy, width, 1), bounds)
+            if span_width > 0 and rows > 0:
+                for span_x, added_width in self._fill_ground(left, row, span_width):
+                    self.history.record(OccupancyGrid.GROUND, True, (span_x, row, added_width))
+        for enemy in enemies:
+            x = enemy.x + dx
+            y = enemy.y + dy
+            if 0 <= x < self.width and 0 <= y < self.height:
+                self._put_enemy(Enemy(x, y, enemy.type_id, enemy.direction, enemy.animation_frame))
+    
+    def _covers_ground(self, pixel_rect):
+        """Whether ground covers every pixel of an (x, y, width, height) pixel rectangle"""
+        if any(value % self.cell_size for value in pixel_rect):
+            return False
+        x, y, width, height = (value // self.cell_size for value in pixel_rect)
+        if y < 0 or y + height > self.height:
+            return False
+        covered = 0
+        for chunk in self._chunks_in(x, width):
+            left = max(x, chunk.x) - chunk.x
+            right = min(x + width, chunk.x + chunk.width) - chunk.x
+            covered += int((chunk.occupancy.counts[OccupancyGrid.GROUND, y:y + height, left:right] > 0).sum())
+        return covered == width * height
+    
+    @staticmethod
+    def _scaled_rect(rect):
+        """Rescaled rect of a lossy element as a tuple, None if it was cut off entirely"""
+        rect = tuple(rect.tolist())
+        return rect if rect[2] and rect[3] else None
+    
+    @staticmethod
+    def _merge_spans(rects):
+        """Join the rows of cell rectangles into non-overlapping (x, y, width) row spans"""
+        spans = []
+        for y, x, end in sorted((row, x, x + width) for x, y, width, height in rects for row in range(y, y + height)):
+            if spans and spans[-1][1] == y and x <= spans[-1][0] + spans[-1][2]:
+                spans[-1][2] = max(spans[-1][2], end - spans[-1][0])
+            else:
+                spans.append([x, y, end - x])
+        return spans
+    
+    @staticmethod
+    def _cell_spans(cells):
+        """Join (x, y) cells into (x, y, width) row spans"""
+        spans = []
+        for y, x in sorted(set((y, x) for x, y in cells)):
+            if spans and spans[-1][1] == y and spans[-1][0] + spans[-1][2] == x:
+                spans[-1][2] += 1
+            else:
+                spans.append([x, y, 1])
+        return spans
+    
+    def _fill_ground(self, x, y, width):
+        """Make cells [x, x + width) of a row ground, returning the (x, width) spans that were not"""
+        # Each chunk merges its own piece of the run
+        added = []
+        end = x + width
+        for index in self._chunk_indices(x, width):
+            chunk = self._chunk(index)
+            start = max(x, chunk.x)
+            added.extend(chunk.add_ground(start, y, min(end, chunk.x + chunk.width) - start))
+        return added
+    
+    def _erase_ground(self, x, y, width):
+        """Clear ground cells [x, x + width) of a row, returning the (x, width) spans that were ground"""
+        removed = []
+        end = x + width
+        for chunk in self._chunks_in(x, width):
+            chunk = self._own(chunk)
+            start = max(x, chunk.x)
+            removed.extend(chunk.erase_ground(start, y, min(end, chunk.x + chunk.width) - start))
+            self._drop_if_empty(chunk)
+        return removed
+    
+    def _apply_change(self, kind, added, payload):
+        """Replay one journaled change (used by undo/redo)"""
+        if kind == OccupancyGrid.GROUND:
+            if added:
+                self._fill_ground(*payload)
+            else:
+                self._erase_ground(*payload)
+        elif kind == OccupancyGrid.PLATFORM:
+            if added:
+                self._place_platform(Platform(*payload))
+            else:
+                x, y, width, height = payload
+                chunk = self._chunks[x // self.chunk_width]
+                # Any platform with the same rect will do; take the newest
+                platform_id = max(platform_id for platform_id in chunk.platform_index.query_point(x, y)
+                                  if chunk.platforms[platform_id].rect == payload)
+                self._remove_platform(chunk.platforms[platform_id], platform_id)
+        elif kind == TileLayer.KIND:
+            name, x, y, width, tile, previous = payload
+            if name not in self.tile_layers:
+                return  # the layer was removed since
+            layer = self._layer(name)
+            if added:
+                layer.fill(x, y, width, tile)
+            else:
+                layer.restore(x, y, width, previous)
+            self._notify(LevelChange.REGION_CHANGED, TileLayer.KIND, x, y, width)
+        else:
+            chunk = self._chunk(payload.x // self.chunk_width)
+            if added:
+                chunk.add_enemy(payload)
+            else:
+                same = (payload.type_id, payload.direction, payload.animation_frame)
+                for enemy_id in reversed(chunk.enemies.ids_at(payload.x, payload.y)):
+                    enemy = chunk.enemies[enemy_id]
+                    if (enemy.type_id, enemy.direction, enemy.animation_frame) == same:
+                        chunk.remove_enemy(enemy_id)
+                        break
+                self._drop_if_empty(chunk)
+    
+    def _rebuild_occupancy(self):
+        """Recreate the cell lookup of every chunk from its elements"""
+        for chunk in list(self._chunks.values()):
+            self._own(chunk).reset(self.height)
     
     def from_dict(self, data):
         """Load level data from a dictionary"""
@@ -244,13 +1047,56 @@ class Level:
             self.cell_size = dim.get('cell_size', Config.DEFAULT_CELL_SIZE)
             self.width_pixels = self.width * self.cell_size
             self.height_pixels = self.height * self.cell_size
+            self._notify_level(LevelChange.LEVEL_RESIZED)
         
-        self.platforms = data.get('platforms', [])
-        self.ground_blocks = data.get('ground_blocks', [])
-        self.enemies = data.get('enemies', [])
+        self.clear()
+        with self._deferred_marks():
+            for platform in data.get('platforms', []):
+                self._place_platform(Platform.from_dict(platform))
+            # Go through add_ground so overlapping or touching blocks saved by
+            # older versions collapse into canonical runs
+            for ground in data.get('ground_blocks', []):
+                ground = GroundRun.from_dict(ground)
+                self._fill_ground(ground.x, ground.y, ground.width)
+            for enemy in data.get('enemies', []):
+                enemy = Enemy.from_dict(enemy)
+                self._chunk(enemy.x // self.chunk_width).add_enemy(enemy)
+        for layer in data.get('tile_layers', []):
+            layer = TileLayer.from_dict(layer)
+            layer.generation = self._generation
+            self.tile_layers[layer.name] = layer
         
         # Load parallax scroll rates
         if 'parallax' in data:
             parallax = data['parallax']
             self.fg_scroll_rate = parallax.get('fg_scroll_rate', 1.0)
-            self.bg_scroll_rate = parallax.get('bg_scroll_rate', 0.2)
\ No newline at end of file
+            self.bg_scroll_rate = parallax.get('bg_scroll_rate', 0.2)
+
+class LevelSnapshot(LevelView):
+    """Frozen view of a Level at the moment Level.snapshot() was called.
+    
+    Offers the same queries and to_dict() as the level but no edits. It
+    shares its chunks with the level, which copies a chunk before changing
+    it, so the snapshot never changes and needs no locking. Element objects
+    it returns are shared too and must not be modified.
+    """
+    def __init__(self, level):
+        self.cell_size = level.cell_size
+        self.width = level.width
+        self.height = level.height
+        self.width_pixels = level.width_pixels
+        self.height_pixels = level.height_pixels
+        self.chunk_width = level.chunk_width
+        self._chunks = level._chunks
+        self.stats = level.stats.copy()
+        self.tile_layers = level.tile_layers
+        
+        # Assets are shared by reference
+        self.background = level.background
+        self.foreground = level.foreground
+        self.platform_image = level.platform_image
+        self.enemy_images = level.enemy_images.copy()
+        self.bg_path = level.bg_path
+        self.fg_path = level.fg_path
+        self.fg_scroll_rate = level.fg_scroll_rate
+        self.bg_scroll_rate = level.bg_scroll_rate
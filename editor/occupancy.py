@@ -0,0 +1,208 @@
+import numpy as np
+
+class OccupancyGrid:
+    """Dense width x height lookup of which level elements cover each cell.
+    
+    Every cell carries a bitmask of the element kinds present. For each kind
+    it also stores the id of the most recently placed element covering the
+    cell and how many elements of that kind are stacked there, so point
+    hit-tests are a couple of array reads instead of a scan of the level.
+    covered_cells holds the number of cells each kind covers; changes are
+    passed on to on_covered(kind, delta).
+    """
+    # Element kinds (also the index into the per-kind layers)
+    PLATFORM = 0
+    GROUND = 1
+    ENEMY = 2
+    KIND_COUNT = 3
+    
+    # Value stored in the id layers for cells without an element of that kind
+    EMPTY = -1
+    
+    def __init__(self, width, height, on_covered=None):
+        self._batch = None  # marks collected between begin_batch() and end_batch()
+        self.on_covered = on_covered
+        self.covered_cells = [0] * self.KIND_COUNT
+        self.reset(width, height)
+    
+    def reset(self, width, height):
+        """Drop all cell data and reallocate the layers for a new size"""
+        if self._batch:
+            self._batch = []
+        for kind in range(self.KIND_COUNT):
+            self._cover(kind, -self.covered_cells[kind])
+        self.width = max(1, width)
+        self.height = max(1, height)
+        self.kinds = np.zeros((self.height, self.width), dtype=np.uint8)
+        self.ids = np.full((self.KIND_COUNT, self.height, self.width), self.EMPTY, dtype=np.int32)
+        self.counts = np.zeros((self.KIND_COUNT, self.height, self.width), dtype=np.uint16)
+    
+    def copy(self):
+        """Independent copy of the grid"""
+        self._flush()
+        grid = OccupancyGrid.__new__(OccupancyGrid)
+        grid._batch = None
+        grid.on_covered = self.on_covered
+        grid.covered_cells = list(self.covered_cells)
+        grid.width = self.width
+        grid.height = self.height
+        grid.kinds = self.kinds.copy()
+        grid.ids = self.ids.copy()
+        grid.counts = self.counts.copy()
+        return grid
+    
+    @staticmethod
+    def bit(kind):
+        """Bitmask value used for a kind in the cell-type layer"""
+        return 1 << kind
+    
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+    
+    def _clip(self, x, y, width, height):
+        """Clip a cell rectangle to the grid, returning (row, column) slices or None"""
+        x0 = max(0, x)
+        y0 = max(0, y)
+        x1 = min(self.width, x + width)
+        y1 = min(self.height, y + height)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return slice(y0, y1), slice(x0, x1)
+    
+    def _cover(self, kind, delta):
+        """Note a change in the number of cells a kind covers"""
+        if delta:
+            self.covered_cells[kind] += delta
+            if self.on_covered is not None:
+                self.on_covered(kind, delta)
+    
+    def _refresh_kinds(self, kind, rows, cols):
+        """Recompute the cell-type bit of one kind over a clipped rectangle"""
+        bit = self.bit(kind)
+        occupied = self.counts[kind, rows, cols] > 0
+        kinds = self.kinds[rows, cols]
+        kinds[occupied] |= bit
+        kinds[~occupied] &= ~bit & 0xFF
+    
+    def begin_batch(self):
+        """Collect marks until end_batch() and apply them in one vectorized pass (for bulk loads)"""
+        if self._batch is None:
+            self._batch = []
+    
+    def end_batch(self):
+        self._flush()
+        self._batch = None
+    
+    def _flush(self):
+        """Apply the marks collected so far in the current batch"""
+        if not self._batch:
+            return
+        marks = np.array(self._batch, dtype=np.int64)
+        self._batch = []
+        for kind in np.unique(marks[:, 0]).tolist():
+            kind_marks = marks[marks[:, 0] == kind]
+            x0 = np.clip(kind_marks[:, 2], 0, self.width)
+            y0 = np.clip(kind_marks[:, 3], 0, self.height)
+            x1 = np.clip(kind_marks[:, 2] + kind_marks[:, 4], 0, self.width)
+            y1 = np.clip(kind_marks[:, 3] + kind_marks[:, 5], 0, self.height)
+            inside = (x0 < x1) & (y0 < y1)
+            element_ids, x0, y0, x1, y1 = (column[inside] for column in (kind_marks[:, 1], x0, y0, x1, y1))
+            
+            # Counts from a 2D difference array of the rectangle corners
+            before = int(np.count_nonzero(self.counts[kind]))
+            corners = np.zeros((self.height + 1, self.width + 1), dtype=np.int32)
+            np.add.at(corners, (y0, x0), 1)
+            np.add.at(corners, (y0, x1), -1)
+            np.add.at(corners, (y1, x0), -1)
+            np.add.at(corners, (y1, x1), 1)
+            self.counts[kind] += corners.cumsum(axis=0).cumsum(axis=1)[:-1, :-1].astype(np.uint16)
+            
+            # Later marks win, as with mark()
+            ids = self.ids[kind]
+            for element_id, left, top, right, bottom in zip(element_ids.tolist(), x0.tolist(), y0.tolist(), x1.tolist(), y1.tolist()):
+                ids[top:bottom, left:right] = element_id
+            occupied = self.counts[kind] > 0
+            self.kinds[occupied] |= self.bit(kind)
+            self._cover(kind, int(np.count_nonzero(occupied)) - before)
+    
+    def mark(self, kind, element_id, x, y, width=1, height=1):
+        """Record an element of the given kind covering a cell rectangle"""
+        if self._batch is not None:
+            self._batch.append((kind, element_id, x, y, width, height))
+            return
+        clipped = self._clip(x, y, width, height)
+        if clipped is None:
+            return
+        rows, cols = clipped
+        counts = self.counts[kind, rows, cols]
+        self._cover(kind, int(np.count_nonzero(counts == 0)))
+        counts += 1
+        self.ids[kind, rows, cols] = element_id
+        self.kinds[rows, cols] |= self.bit(kind)
+    
+    def unmark(self, kind, element_id, x, y, width=1, height=1):
+        """Remove an element from a cell rectangle.
+        
+        Returns True if some cells are still covered by other elements of the
+        same kind but were labelled with the removed id; the caller has to
+        relabel those with one of the remaining elements.
+        """
+        if self._batch:
+            self._flush()
+        clipped = self._clip(x, y, width, height)
+        if clipped is None:
+            return False
+        rows, cols = clipped
+        counts = self.counts[kind, rows, cols]
+        self._cover(kind, -int(np.count_nonzero(counts == 1)))
+        counts[counts > 0] -= 1
+        ids = self.ids[kind, rows, cols]
+        ids[counts == 0] = self.EMPTY
+        self._refresh_kinds(kind, rows, cols)
+        return bool((ids == element_id).any())
+    
+    def relabel(self, kind, old_id, new_id, x, y, width=1, height=1):
+        """Replace an element id with another one inside a cell rectangle"""
+        if self._batch:
+            self._flush()
+        clipped = self._clip(x, y, width, height)
+        if clipped is None:
+            return
+        rows, cols = clipped
+        ids = self.ids[kind, rows, cols]
+        ids[ids == old_id] = new_id
+    
+    def covered(self, kind, x, y, width, height):
+        """Boolean (height, width) array of the cells of a rectangle holding an element of a kind"""
+        if self._batch:
+            self._flush()
+        cells = np.zeros((max(0, height), max(0, width)), dtype=bool)
+        clipped = self._clip(x, y, width, height)
+        if clipped is not None:
+            rows, cols = clipped
+            cells[rows.start - y:rows.stop - y, cols.start - x:cols.stop - x] = self.counts[kind, rows, cols] > 0
+        return cells
+    
+    def kinds_at(self, x, y):
+        """Bitmask of the element kinds covering a cell (0 outside the grid)"""
+        if self._batch:
+            self._flush()
+        if not self.in_bounds(x, y):
+            return 0
+        return int(self.kinds[y, x])
+    
+    def id_at(self, kind, x, y):
+        """Id of the most recently placed element of a kind covering a cell"""
+        if self._batch:
+            self._flush()
+        if not self.in_bounds(x, y):
+            return self.EMPTY
+        return int(self.ids[kind, y, x])
+    
+    def count_at(self, kind, x, y):
+        """Number of elements of a kind stacked on a cell"""
+        if self._batch:
+            self._flush()
+        if not self.in_bounds(x, y):
+            return 0
+        return int(self.counts[kind, y, x])
@@ -0,0 +1,92 @@
+import pygame
+from editor.config import Config
+
+class ParallaxStrip:
+    """One parallax layer pre-tiled into a strip one image wider than the window.
+    
+    Any scroll position is a window-wide sub-rectangle of the strip, so
+    drawing the layer is a single blit with no clipping. The strip is in the
+    display's pixel format and is only rebuilt when the image, the window
+    width or the viewport height changes.
+    """
+    def __init__(self):
+        self.surface = None
+        self.image_width = 1
+        self.version = 0  # bumped on every rebuild
+        self._image = None
+        self._size = None
+    
+    def update(self, image, width, height):
+        """Rebuild the strip if its image or size changed; returns True if it was rebuilt"""
+        if image is self._image and (width, height) == self._size:
+            return False
+        self._image = image
+        self._size = (width, height)
+        self.version += 1
+        if image is None:
+            self.surface = None
+            return True
+        self.image_width = max(1, image.get_width())
+        strip_height = min(image.get_height(), height)
+        strip = pygame.Surface((width + self.image_width, strip_height), pygame.SRCALPHA)
+        for x in range(0, strip.get_width(), self.image_width):
+            strip.blit(image, (x, 0))
+        try:
+            strip = strip.convert_alpha()
+        except pygame.error:
+            pass  # no display yet; keep the plain surface
+        self.surface = strip
+        return True
+    
+    def area(self, scroll, width):
+        """Source rectangle of the strip showing the layer scrolled by scroll pixels"""
+        return pygame.Rect(int(scroll % self.image_width), 0, width, self.surface.get_height())
+
+class ParallaxCache:
+    """Background and foreground strips of a level, drawn below the UI panel.
+    
+    While neither layer changes between frames (camera still, same assets)
+    both are composited once into a window-sized surface and every further
+    frame is a single blit of it.
+    """
+    def __init__(self):
+        self.background = ParallaxStrip()
+        self.foreground = ParallaxStrip()
+        self._composite = None
+        self._composite_state = None
+        self._last_state = None
+    
+    def render(self, surface, level, camera_x):
+        width = Config.WINDOW_WIDTH
+        top = Config.UI_PANEL_HEIGHT
+        height = max(1, Config.WINDOW_HEIGHT - top)
+        self.background.update(level.background, width, height)
+        self.foreground.update(level.foreground, width, height)
+    
+        layers = []
+        for strip, rate in ((self.background, getattr(level, 'bg_scroll_rate', 0.25)),
+                            (self.foreground, getattr(level, 'fg_scroll_rate', 1.0))):
+            if strip.surface is not None:
+                layers.append((strip, strip.area(camera_x * rate, width)))
+        if not layers:
+            return
+    
+        state = (width, height, tuple((strip.version, tuple(area)) for strip, area in layers))
+        if state != self._last_state:
+            # Scrolling or new assets: draw the layers directly this frame
+            self._last_state = state
+            for strip, area in layers:
+                surface.blit(strip.surface, (0, top), area)
+            return
+        if state != self._composite_state:
+            if self._composite is None or self._composite.get_size() != (width, height):
+                self._composite = pygame.Surface((width, height))
+                try:
+                    self._composite = self._composite.convert()
+                except pygame.error:
+                    pass
+            self._composite.fill(Config.BG_COLOR)
+            for strip, area in layers:
+                self._composite.blit(strip.surface, (0, 0), area)
+            self._composite_state = state
+        surface.blit(self._composite, (0, top))
@@ -0,0 +1,52 @@
+import pygame
+
+class DamagePresenter:
+    """Puts rendered frames on the display, pushing only what changed when it can.
+    
+    The caller renders the whole frame as before and hands over a scene key:
+    anything that moves or restyles the whole view (camera position, window
+    size, grid, cell size...). While the key stays the same, a frame only
+    pushes the rects damaged since the last frame plus the overlays (tool
+    preview, HUD text) drawn this frame and the last one, so the old overlay
+    gets wiped. A new key, invalidate(), or damage covering most of the
+    window presents the whole frame with display.flip() instead.
+    """
+    FULL_FRACTION = 0.5  # damaged share of the window above which a flip is cheaper
+    
+    def __init__(self):
+        self._damage = []
+        self._overlays = []
+        self._key = None
+        self.frames = 0
+        self.full_frames = 0
+        self.pixels = 0  # pixels pushed by the last frame
+    
+    def damage(self, rect):
+        """Mark a screen rect as changed for the next frame"""
+        self._damage.append(pygame.Rect(rect))
+    
+    def invalidate(self):
+        """Present the next frame in full (something else drew to the display)"""
+        self._key = None
+    
+    def present(self, screen, key, overlays=(), full=False):
+        """Show the frame rendered to screen; overlays are this frame's transient rects"""
+        overlays = [pygame.Rect(rect) for rect in overlays if rect]
+        bounds = screen.get_rect()
+        rects = [rect.clip(bounds) for rect in self._damage + self._overlays + overlays]
+        rects = [rect for rect in rects if rect.width > 0 and rect.height > 0]
+        self._damage = []
+        self._overlays = overlays
+        self.frames += 1
+    
+        area = sum(rect.width * rect.height for rect in rects)
+        window = bounds.width * bounds.height
+        if full or key != self._key or area > window * self.FULL_FRACTION:
+            self._key = key
+            self.full_frames += 1
+            self.pixels = window
+            pygame.display.flip()
+        else:
+            self.pixels = area
+            if rects:
+                pygame.display.update(rects)
@@ -0,0 +1,190 @@
+from collections import OrderedDict
+import pygame
+from editor.config import Config
+from editor.changes import LevelChange
+from editor.occupancy import OccupancyGrid
+from editor.tile_layers import TileLayer
+
+class RenderTile:
+    """One baked column strip of the level and the cell rects it still has to repaint"""
+    __slots__ = ('surface', 'dirty')
+    
+    def __init__(self, surface):
+        self.surface = surface
+        self.dirty = []
+
+class StaticLayerCache:
+    """Tile layers, platforms and ground baked into cached column tiles.
+    
+    The level is cut into tiles about Config.RENDER_TILE_WIDTH pixels wide
+    (a whole number of cells) and as tall as the level. A tile is baked the
+    first time the camera reaches it and kept in least recently used order;
+    once the tiles take more than Config.RENDER_CACHE_BYTES the oldest ones
+    not on screen are dropped, so memory stays flat however wide the level
+    is. A steady frame is one blit per visible tile.
+    
+    Level changes only mark the cell rectangles they report as dirty (plus a
+    one-cell ring, since ground frames depend on their neighbours) in the
+    tiles that hold them; those cells are repainted before the tile is next
+    drawn. Resizes and cell size changes drop every tile.
+    
+    Tiles use a colorkey, which blits about twice as fast as per-pixel
+    alpha; only a ground tileset with an alpha channel switches them to
+    alpha surfaces so its edges still blend. (RLE acceleration is not used:
+    repainting dirty cells of an RLE surface loses pixels.)
+    """
+    STATIC_KINDS = (OccupancyGrid.PLATFORM, OccupancyGrid.GROUND, TileLayer.KIND, None)
+    MAX_DIRTY = 256  # dirty rects queued for a tile before it is simply re-baked
+    PLATFORM_COLOR = (150, 75, 0)
+    COLORKEY = (255, 0, 255)
+    
+    def __init__(self, level, autotiler, budget=None):
+        self.level = level
+        self.autotiler = autotiler
+        self.budget = Config.RENDER_CACHE_BYTES if budget is None else budget
+        self.cell_size = None
+        self.tile_columns = 1  # level columns per tile
+        self.tiles = OrderedDict()  # tile index -> RenderTile, least recently used first
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._alpha = False
+        level.add_listener(self.on_level_change)
+    
+    def on_level_change(self, change):
+        if change.type in (LevelChange.LEVEL_RESIZED, LevelChange.CELL_SIZE_CHANGED):
+            self.invalidate()
+        elif change.kind in self.STATIC_KINDS and self.tiles:
+            x, y, width, height = change.rect
+            # Ground frames of the ring around the change can change too
+            x, y, width, height = x - 1, y - 1, width + 2, height + 2
+            columns = self.tile_columns
+            for index in range(max(0, x) // columns, max(0, x + width - 1) // columns + 1):
+                tile = self.tiles.get(index)
+                if tile is None:
+                    continue
+                if len(tile.dirty) >= self.MAX_DIRTY:
+                    self._drop(index)
+                else:
+                    tile.dirty.append((x, y, width, height))
+    
+    def invalidate(self):
+        """Drop every tile; they are baked again as they come into view"""
+        self.tiles.clear()
+        self.bytes = 0
+    
+    def stats(self):
+        return {'tiles': len(self.tiles), 'bytes': self.bytes, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
+    
+    def render(self, screen, camera_x, cell_size):
+        """Draw the visible tiles below the UI panel"""
+        if cell_size != self.cell_size:
+            self.cell_size = cell_size
+            self.tile_columns = max(1, Config.RENDER_TILE_WIDTH // cell_size)
+            self._alpha = any(frame.get_flags() & pygame.SRCALPHA
+                              for frame in self.autotiler.frame_surfaces(cell_size))
+            self.invalidate()
+    
+        top = Config.UI_PANEL_HEIGHT
+        tile_width = self.tile_columns * cell_size
+        left = max(0, int(camera_x))
+        right = min(self.level.width * cell_size, left + Config.WINDOW_WIDTH)
+        if right <= left:
+            return
+        visible = range(left // tile_width, (right - 1) // tile_width + 1)
+        blits = []
+        for index in visible:
+            tile = self._tile(index)
+            tile_left = index * tile_width
+            start = max(left, tile_left)
+            end = min(right, tile_left + tile_width)
+            blits.append((tile.surface, (start - camera_x, top),
+                          pygame.Rect(start - tile_left, 0, end - start, Config.WINDOW_HEIGHT - top)))
+        screen.blits(blits, doreturn=False)
+        self._evict(visible)
+    
+    def _tile(self, index):
+        """Tile of an index, baked if it is not cached, with its dirty cells repainted"""
+        tile = self.tiles.get(index)
+        if tile is None:
+            self.misses += 1
+            tile = self.tiles[index] = RenderTile(self._new_surface())
+            self.bytes += self._surface_bytes(tile.surface)
+            self._paint(index, tile.surface, index * self.tile_columns, 0, self.tile_columns, self.level.height)
+            return tile
+        self.hits += 1
+        self.tiles.move_to_end(index)
+        dirty = tile.dirty
+        tile.dirty = []
+        for x, y, width, height in dirty:
+            self._paint(index, tile.surface, x, y, width, height)
+        return tile
+    
+    def _evict(self, keep):
+        """Drop least recently used tiles outside keep until the cache fits its budget"""
+        for index in list(self.tiles):
+            if self.bytes <= self.budget:
+                break
+            if index not in keep:
+                self._drop(index)
+                self.evictions += 1
+    
+    def _drop(self, index):
+        tile = self.tiles.pop(index)
+        self.bytes -= self._surface_bytes(tile.surface)
+    
+    def _surface_bytes(self, surface):
+        return surface.get_pitch() * surface.get_height()
+    
+    def _new_surface(self):
+        size = (self.tile_columns * self.cell_size, max(1, self.level.height * self.cell_size))
+        try:
+            if self._alpha:
+                surface = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+            else:
+                surface = pygame.Surface(size).convert()
+        except pygame.error:
+            surface = pygame.Surface(size, pygame.SRCALPHA if self._alpha else 0)  # no display yet
+        if not self._alpha:
+            surface.set_colorkey(self.COLORKEY)
+        return surface
+    
+    def _paint(self, index, surface, x, y, width, height):
+        """Redraw the static elements of a cell rectangle of the tile at index"""
+        cell_size = self.cell_size
+        level = self.level
+        offset = index * self.tile_columns
+        # Cells past the level's right edge stay clear. Fill rects are clipped
+        # here: Surface.fill moves a rect with a negative x instead of cutting it
+        dirty = pygame.Rect((x - offset) * cell_size, y * cell_size, width * cell_size, height * cell_size)
+        surface.fill((0, 0, 0, 0) if self._alpha else self.COLORKEY, dirty.clip(surface.get_rect()))
+        right = min(level.width, offset + self.tile_columns, x + width)
+        bottom = min(level.height, y + height)
+        x = max(offset, x)
+        y = max(0, y)
+        width = right - x
+        height = bottom - y
+        if width <= 0 or height <= 0:
+            return
+        # Level cell (cx, cy) is at tile pixel ((cx - offset) * cell_size, cy * cell_size)
+        origin = offset * cell_size
+        clip = pygame.Rect((x - offset) * cell_size, y * cell_size, width * cell_size, height * cell_size)
+        surface.set_clip(clip)
+    
+        for layer in level.tile_layers.values():
+            for run_x, run_y, run_width, tile in layer.runs_in_rect(x, y, width, height):
+                color = Config.TILE_COLORS[(tile - 1) % len(Config.TILE_COLORS)]
+                surface.fill(color, clip.clip(run_x * cell_size - origin, run_y * cell_size, run_width * cell_size, cell_size))
+    
+        for platform in level.platforms_in_rect(x, y, width, height):
+            surface.fill(self.PLATFORM_COLOR, clip.clip(platform.x * cell_size - origin, platform.y * cell_size,
+                                                        platform.width * cell_size, platform.height * cell_size))
+    
+        frames = self.autotiler.frames_in_rect(x, y, width, height)
+        frame_surfaces = self.autotiler.frame_surfaces(cell_size)
+        rows, cols = (frames >= 0).nonzero()
+        surface.blits([(frame_surfaces[frames[row, col]], ((x - offset + col) * cell_size, (y + row) * cell_size))
+                       for row, col in zip(rows.tolist(), cols.tolist())], doreturn=False)
+        surface.set_clip(None)
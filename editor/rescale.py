@@ -0,0 +1,47 @@
+import numpy as np
+
+def scale_rects(rects, old_size, new_size):
+    """Map cell rectangles onto a grid with a different cell size.
+    
+    Each rectangle becomes the smallest one on the new grid covering all of
+    its old pixels. Returns an (n, 4) array of new rectangles and a boolean
+    mask of the ones whose pixels match exactly.
+    """
+    rects = np.asarray(rects, dtype=np.int64).reshape(-1, 4)
+    pixels = rects * old_size
+    left = pixels[:, 0] // new_size
+    top = pixels[:, 1] // new_size
+    right = -(-(pixels[:, 0] + pixels[:, 2]) // new_size)
+    bottom = -(-(pixels[:, 1] + pixels[:, 3]) // new_size)
+    scaled = np.stack((left, top, right - left, bottom - top), axis=1)
+    exact = (scaled * new_size == pixels).all(axis=1)
+    return scaled, exact
+
+def scale_cells(cells, old_size, new_size):
+    """Map (x, y) cells onto a grid with a different cell size.
+    
+    A cell goes to the new cell holding its bottom-centre point, where
+    sprites are anchored. Returns an (n, 2) array of new cells and a mask
+    of the ones whose anchor lands exactly on the new cell's anchor.
+    """
+    cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+    # Work in half pixels so odd cell sizes have an exact centre
+    center = (2 * cells[:, 0] + 1) * old_size
+    bottom = (cells[:, 1] + 1) * old_size
+    x = center // (2 * new_size)
+    y = (bottom - 1) // new_size
+    exact = ((2 * x + 1) * new_size == center) & ((y + 1) * new_size == bottom)
+    return np.stack((x, y), axis=1), exact
+
+def clip_rects(rects, width, height):
+    """Clip an (n, 4) array of cell rectangles to a width x height grid.
+    
+    Rectangles entirely outside end up with no width or height. Returns
+    the clipped rectangles and a mask of the ones that were left whole.
+    """
+    left = rects[:, 0].clip(0, width)
+    top = rects[:, 1].clip(0, height)
+    right = (rects[:, 0] + rects[:, 2]).clip(0, width)
+    bottom = (rects[:, 1] + rects[:, 3]).clip(0, height)
+    clipped = np.stack((left, top, np.maximum(0, right - left), np.maximum(0, bottom - top)), axis=1)
+    return clipped, (clipped == rects).all(axis=1)
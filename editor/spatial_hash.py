@@ -0,0 +1,83 @@
+class SpatialHash:
+    """Uniform grid of square buckets over cell rectangles.
+    
+    Every rectangle is registered in each bucket it overlaps, so point and
+    rectangle queries only visit the buckets under the query instead of every
+    rectangle in the level.
+    """
+    def __init__(self, bucket_size=8):
+        self.bucket_size = max(1, bucket_size)
+        self._buckets = {}  # (bucket_x, bucket_y) -> set of ids
+        self._rects = {}    # id -> (x, y, width, height)
+    
+    def clear(self):
+        self._buckets.clear()
+        self._rects.clear()
+    
+    def __len__(self):
+        return len(self._rects)
+    
+    def copy(self):
+        """Independent copy of the index"""
+        index = SpatialHash(self.bucket_size)
+        index._buckets = {key: set(bucket) for key, bucket in self._buckets.items()}
+        index._rects = dict(self._rects)
+        return index
+    
+    def set_bucket_size(self, bucket_size):
+        """Change the bucket size and rehash every rectangle"""
+        rects = list(self._rects.items())
+        self.bucket_size = max(1, bucket_size)
+        self.clear()
+        for item_id, rect in rects:
+            self.insert(item_id, *rect)
+    
+    def _bucket_keys(self, x, y, width, height):
+        size = self.bucket_size
+        x1 = x + max(1, width) - 1
+        y1 = y + max(1, height) - 1
+        for bucket_x in range(x // size, x1 // size + 1):
+            for bucket_y in range(y // size, y1 // size + 1):
+                yield bucket_x, bucket_y
+    
+    def insert(self, item_id, x, y, width, height):
+        """Register a rectangle under an id"""
+        self._rects[item_id] = (x, y, width, height)
+        for key in self._bucket_keys(x, y, width, height):
+            self._buckets.setdefault(key, set()).add(item_id)
+    
+    def remove(self, item_id):
+        """Unregister the rectangle stored under an id"""
+        rect = self._rects.pop(item_id)
+        for key in self._bucket_keys(*rect):
+            bucket = self._buckets[key]
+            bucket.discard(item_id)
+            if not bucket:
+                del self._buckets[key]
+    
+    def query_point(self, x, y):
+        """Ids of the rectangles covering a cell, oldest first"""
+        size = self.bucket_size
+        bucket = self._buckets.get((x // size, y // size))
+        if not bucket:
+            return []
+        found = []
+        for item_id in bucket:
+            rx, ry, rwidth, rheight = self._rects[item_id]
+            if rx <= x < rx + rwidth and ry <= y < ry + rheight:
+                found.append(item_id)
+        return sorted(found)
+    
+    def query_rect(self, x, y, width, height):
+        """Ids of the rectangles overlapping a cell rectangle, oldest first"""
+        candidates = set()
+        for key in self._bucket_keys(x, y, width, height):
+            bucket = self._buckets.get(key)
+            if bucket:
+                candidates.update(bucket)
+        found = []
+        for item_id in candidates:
+            rx, ry, rwidth, rheight = self._rects[item_id]
+            if rx < x + width and x < rx + rwidth and ry < y + height and y < ry + rheight:
+                found.append(item_id)
+        return sorted(found)
@@ -0,0 +1,53 @@
+from editor.occupancy import OccupancyGrid
+from editor.enemy_types import ENEMY_TYPES
+
+class LevelStats:
+    """Element counts of a level, updated by the level on every mutation.
+
+    Reading any figure is O(1) (enemies_by_type() is O(types)), so the
+    status bar can show them every frame however large the level is.
+    cells holds the number of cells covered per OccupancyGrid kind; ground
+    never overlaps, so its entry is also the number of ground cells.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.platforms = 0
+        self.enemies = 0
+        self.cells = [0] * OccupancyGrid.KIND_COUNT
+        self.enemy_types = []  # enemy count per ENEMY_TYPES id
+
+    def copy(self):
+        stats = LevelStats()
+        stats.platforms = self.platforms
+        stats.enemies = self.enemies
+        stats.cells = list(self.cells)
+        stats.enemy_types = list(self.enemy_types)
+        return stats
+
+    @property
+    def ground_cells(self):
+        return self.cells[OccupancyGrid.GROUND]
+
+    def covered(self, kind, delta):
+        """OccupancyGrid.on_covered callback"""
+        self.cells[kind] += delta
+
+    def enemy_changed(self, type_id, delta):
+        self.enemies += delta
+        if type_id >= len(self.enemy_types):
+            self.enemy_types.extend([0] * (type_id + 1 - len(self.enemy_types)))
+        self.enemy_types[type_id] += delta
+
+    def enemies_by_type(self):
+        """{type name: count} of the types present in the level"""
+        return {ENEMY_TYPES.names[type_id]: count for type_id, count in enumerate(self.enemy_types) if count}
+
+    def per_screen(self, level_width, screen_columns):
+        """Average (platforms, ground cells, enemies) per screen width of level"""
+        screens = max(1.0, level_width / max(1, screen_columns))
+        return self.platforms / screens, self.ground_cells / screens, self.enemies / screens
+
+    def summary(self):
+        return f"{self.platforms} platforms, {self.ground_cells} ground cells, {self.enemies} enemies"
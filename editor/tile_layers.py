@@ -0,0 +1,170 @@
+from bisect import bisect_left, bisect_right
+
+class TileLayer:
+    """Named layer of tile ids stored as run-length encoded rows.
+    
+    Each row keeps three parallel lists (run starts, run ends and tile ids)
+    sorted by x. Empty cells (tile 0) are not stored and neighbouring runs of
+    the same tile are always merged, so memory follows the painted runs
+    rather than width x height and a point lookup is a bisect. Solid layers
+    are meant for collision, the others are decoration.
+    
+    Rows can be shared with the copy made by copy(); a row is duplicated
+    before its first change, so a copy costs one dict copy however much the
+    layer holds.
+    """
+    EMPTY = 0
+    KIND = 'tiles'  # LevelChange/undo kind of tile edits
+    
+    def __init__(self, name, solid=False):
+        self.name = name
+        self.solid = solid
+        self.generation = 0
+        self._rows = {}  # y -> [starts, ends, tiles]
+        self._owned = set()  # rows this layer may change in place
+    
+    def __len__(self):
+        """Number of runs in the layer"""
+        return sum(len(row[0]) for row in self._rows.values())
+    
+    def is_empty(self):
+        return not self._rows
+    
+    def copy(self, generation=0):
+        """Copy sharing the rows, which either side copies before changing"""
+        layer = TileLayer(self.name, self.solid)
+        layer.generation = generation
+        layer._rows = dict(self._rows)
+        self._owned.clear()
+        return layer
+    
+    def rows(self):
+        """Rows holding tiles, top to bottom"""
+        return sorted(self._rows)
+    
+    def tile_at(self, x, y):
+        """Tile id on cell (x, y), or EMPTY"""
+        row = self._rows.get(y)
+        if not row:
+            return self.EMPTY
+        starts, ends, tiles = row
+        i = bisect_right(starts, x) - 1
+        if i >= 0 and x < ends[i]:
+            return tiles[i]
+        return self.EMPTY
+    
+    def runs(self, y, x=None, width=None):
+        """(x, width, tile) of the runs of row y overlapping [x, x + width), clipped to it"""
+        row = self._rows.get(y)
+        if not row:
+            return []
+        starts, ends, tiles = row
+        if x is None:
+            return [(start, end - start, tile) for start, end, tile in zip(starts, ends, tiles)]
+        end = x + width
+        lo = bisect_right(ends, x)
+        hi = bisect_left(starts, end)
+        runs = []
+        for i in range(lo, hi):
+            left = max(x, starts[i])
+            runs.append((left, min(end, ends[i]) - left, tiles[i]))
+        return runs
+    
+    def runs_in_rect(self, x, y, width, height):
+        """Yield (x, y, width, tile) for every run inside a cell rectangle, clipped to it"""
+        if height > len(self._rows):
+            rows = [row for row in sorted(self._rows) if y <= row < y + height]
+        else:
+            rows = [row for row in range(y, y + height) if row in self._rows]
+        for row in rows:
+            for run_x, run_width, tile in self.runs(row, x, width):
+                yield run_x, row, run_width, tile
+    
+    def fill(self, x, y, width, tile):
+        """Set cells [x, x + width) of row y to tile (EMPTY clears them).
+    
+        Returns the (x, width, tile) runs that were there before, clipped to
+        the filled span, so the change can be undone.
+        """
+        if width <= 0:
+            return []
+        end = x + width
+        previous = self.runs(y, x, width)
+        if not previous and tile == self.EMPTY:
+            return previous
+    
+        starts, ends, tiles = self._row(y)
+        # Runs overlapping or touching the span get rewritten
+        lo = bisect_left(ends, x)
+        hi = bisect_right(starts, end)
+        pieces = []
+        if lo < hi and starts[lo] < x:
+            pieces.append([starts[lo], x, tiles[lo]])
+        if tile != self.EMPTY:
+            pieces.append([x, end, tile])
+        if lo < hi and ends[hi - 1] > end:
+            pieces.append([end, ends[hi - 1], tiles[hi - 1]])
+        # Join the new run with touching neighbours of the same tile
+        merged = []
+        for piece in pieces:
+            if merged and merged[-1][1] == piece[0] and merged[-1][2] == piece[2]:
+                merged[-1][1] = piece[1]
+            else:
+                merged.append(piece)
+        starts[lo:hi] = [piece[0] for piece in merged]
+        ends[lo:hi] = [piece[1] for piece in merged]
+        tiles[lo:hi] = [piece[2] for piece in merged]
+        if not starts:
+            del self._rows[y]
+            self._owned.discard(y)
+        return previous
+    
+    def restore(self, x, y, width, runs):
+        """Put back the runs returned by fill() for the same span"""
+        self.fill(x, y, width, self.EMPTY)
+        for run_x, run_width, tile in runs:
+            self.fill(run_x, y, run_width, tile)
+    
+    def crop(self, width, height):
+        """Clear everything at columns >= width or rows >= height; returns True if anything was removed"""
+        cropped = False
+        for y in list(self._rows):
+            if y >= height:
+                del self._rows[y]
+                self._owned.discard(y)
+                cropped = True
+                continue
+            ends = self._rows[y][1]
+            if ends[-1] > width:
+                self.fill(width, y, ends[-1] - width, self.EMPTY)
+                cropped = True
+        return cropped
+    
+    def _row(self, y):
+        """Row lists safe to change, created or copied if needed"""
+        row = self._rows.get(y)
+        if row is None:
+            row = self._rows[y] = [[], [], []]
+        elif y not in self._owned:
+            row = self._rows[y] = [list(row[0]), list(row[1]), list(row[2])]
+        self._owned.add(y)
+        return row
+    
+    def to_dict(self):
+        """Compact form: each row is [y, x, width, tile, x, width, tile, ...]"""
+        rows = []
+        for y in sorted(self._rows):
+            row = [y]
+            for start, end, tile in zip(*self._rows[y]):
+                row.extend((start, end - start, tile))
+            rows.append(row)
+        return {'name': self.name, 'solid': self.solid, 'rows': rows}
+    
+    @classmethod
+    def from_dict(cls, data):
+        layer = cls(data['name'], data.get('solid', False))
+        for row in data.get('rows', []):
+            y = row[0]
+            for i in range(1, len(row) - 2, 3):
+                layer.fill(row[i], y, row[i + 1], row[i + 2])
+        return layer
@@ -1,19 +1,95 @@
 import pygame
 from editor.config import Config
+from editor.utils.coordinates import grid_line
 
 class Tool:
     def __init__(self, level, grid):
         self.level = level
         self.grid = grid
         self.preview = None
+        self.last_pos = None       # last cell of the current drag path
+        self.pending_motion = []   # mouse positions dragged through this frame
     
     def handle_event(self, event, camera):
         """Handle input events for the tool"""
         pass
     
+    def update(self, camera):
+        """Called once per frame after that frame's events were handled"""
+        pass
+    
+    def deactivate(self, camera):
+        """Finish a drag in progress when another tool is picked, closing its undo step"""
+        if self.pending_motion and camera is not None:
+            self.update(camera)
+        self.pending_motion = []
+        self.last_pos = None
+        self.preview = None
+        self.level.history.end_stroke()
+    
+    def take_path(self, camera):
+        """Cells of the drag path since the last call, in drag order.
+        
+        The queued mouse positions are joined with grid lines so fast drags
+        leave no gaps. Cells outside the level are left out, positions over
+        the UI panel are skipped.
+        """
+        cells = []
+        for mouse_x, mouse_y in self.pending_motion:
+            if mouse_y < Config.UI_PANEL_HEIGHT:
+                continue
+            grid_pos = self.grid.screen_to_grid(mouse_x, mouse_y, camera)
+            if grid_pos == self.last_pos:
+                continue
+            if self.last_pos is None:
+                path = [grid_pos]
+            else:
+                path = grid_line(*self.last_pos, *grid_pos)[1:]
+            cells.extend((x, y) for x, y in path if 0 <= x < self.level.width and 0 <= y < self.level.height)
+            self.last_pos = grid_pos
+        self.pending_motion = []
+        return cells
+    
     def render_preview(self, surface, camera):
         """Render a preview of the tool's action"""
         pass
+    
+    def preview_rect(self, camera):
+        """Screen rect render_preview() may draw in: the drag rectangle and the cell under the mouse"""
+        rect = None
+        if self.preview:
+            x, y, width, height = self.preview
+            screen_x, screen_y = self.grid.grid_to_screen(x, y, camera)
+            rect = pygame.Rect(screen_x, screen_y, width * self.grid.cell_size, height * self.grid.cell_size)
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+        if mouse_y >= Config.UI_PANEL_HEIGHT:
+            grid_x, grid_y = self.grid.screen_to_grid(mouse_x, mouse_y, camera)
+            screen_x, screen_y = self.grid.grid_to_screen(grid_x, grid_y, camera)
+            # Outlines, lines and the enemy marker reach a few pixels past the cell
+            cell = pygame.Rect(screen_x - 4, screen_y - 4, self.grid.cell_size + 8, self.grid.cell_size + 8)
+            rect = cell.union(rect) if rect else cell
+        return rect
+    
+    def drag_rect(self, start_pos, camera):
+        """Cell rectangle from start_pos to the mouse, clamped to the level"""
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_y = max(mouse_y, Config.UI_PANEL_HEIGHT)
+        end_x, end_y = self.grid.screen_to_grid(mouse_x, mouse_y, camera)
+        end_x = max(0, min(end_x, self.level.width - 1))
+        end_y = max(0, min(end_y, self.level.height - 1))
+        start_x, start_y = start_pos
+        return (min(start_x, end_x), min(start_y, end_y),
+                abs(end_x - start_x) + 1, abs(end_y - start_y) + 1)
+    
+    def render_rect_preview(self, surface, camera, color):
+        """Draw the rectangle being dragged out (Shift+drag area tools)"""
+        if not self.preview:
+            return
+        x, y, width, height = self.preview
+        screen_x, screen_y = self.grid.grid_to_screen(x, y, camera)
+        preview_surface = pygame.Surface((width * self.grid.cell_size, height * self.grid.cell_size), pygame.SRCALPHA)
+        preview_surface.fill(color)
+        surface.blit(preview_surface, (screen_x, screen_y))
 
 class PlatformTool(Tool):
     def __init__(self, level, grid):
@@ -21,6 +97,11 @@ class PlatformTool(Tool):
         self.start_pos = None
         self.dragging = False
     
+    def deactivate(self, camera):
+        self.start_pos = None
+        self.dragging = False
+        super().deactivate(camera)
+    
     def handle_event(self, event, camera):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             # Convert mouse position to grid coordinates
@@ -117,10 +198,17 @@ class PlatformTool(Tool):
 class GroundTool(Tool):
     def __init__(self, level, grid):
         super().__init__(level, grid)
-        self.last_pos = None
+        self.rect_start = None  # Shift+drag fills a whole rectangle
+    
+    def deactivate(self, camera):
+        self.rect_start = None
+        super().deactivate(camera)
     
     def handle_event(self, event, camera):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            # The whole drag is a single undo step
+            self.level.history.begin_stroke()
+            
             # Convert mouse position to grid coordinates
             mouse_x, mouse_y = pygame.mouse.get_pos()
             
@@ -134,34 +222,41 @@ class GroundTool(Tool):
             if grid_x >= self.level.width or grid_y >= self.level.height or grid_x < 0 or grid_y < 0:
                 return
             
+            if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+                self.rect_start = (grid_x, grid_y)
+                self.preview = (grid_x, grid_y, 1, 1)
+                return
+            
             # Add ground block
             self.level.add_ground(grid_x, grid_y)
             self.last_pos = (grid_x, grid_y)
         
+        elif event.type == pygame.MOUSEMOTION and event.buttons[0] and self.rect_start:
+            self.preview = self.drag_rect(self.rect_start, camera)
+        
         elif event.type == pygame.MOUSEMOTION and event.buttons[0]:
-            # Convert mouse position to grid coordinates
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-            
-            # Skip if mouse is in UI area
-            if mouse_y < Config.UI_PANEL_HEIGHT:
-                return
-                
-            grid_x, grid_y = self.grid.screen_to_grid(mouse_x, mouse_y, camera)
-            
-            # Ensure within level bounds
-            if grid_x >= self.level.width or grid_y >= self.level.height or grid_x < 0 or grid_y < 0:
-                return
-            
-            # Check if we've moved to a new cell
-            if self.last_pos != (grid_x, grid_y):
-                # Add ground block
-                self.level.add_ground(grid_x, grid_y)
-                self.last_pos = (grid_x, grid_y)
+            # Painted once per frame in update()
+            self.pending_motion.append(event.pos)
         
         elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            if self.rect_start:
+                self.level.fill_rect(*self.drag_rect(self.rect_start, camera))
+                self.rect_start = None
+                self.preview = None
+            self.update(camera)
             self.last_pos = None
+            self.level.history.end_stroke()
+    
+    def update(self, camera):
+        cells = self.take_path(camera)
+        if cells:
+            self.level.add_ground_cells(cells)
     
     def render_preview(self, surface, camera):
+        if self.rect_start:
+            self.render_rect_preview(surface, camera, (70, 40, 0, 128))
+            return
+        
         # Get current mouse position
         mouse_x, mouse_y = pygame.mouse.get_pos()
         
@@ -212,6 +307,15 @@ class EnemyTool(Tool):
         """Set the type of enemy to place"""
         self.enemy_type = enemy_type
     
+    def preview_rect(self, camera):
+        """The hovered cell plus the sprite standing on it, which can overhang it"""
+        rect = super().preview_rect(camera)
+        sprite = self.level.enemy_images.get(self.enemy_type)
+        if rect and sprite:
+            width, height = sprite.get_size()
+            rect = rect.union(pygame.Rect(rect.centerx - width // 2 - 1, rect.bottom - 4 - height, width + 2, height + 2))
+        return rect
+    
     def render_preview(self, surface, camera):
         # Save current clip area and remove any clipping to ensure the preview
         # can extend beyond grid boundaries
@@ -270,9 +374,17 @@ class EnemyTool(Tool):
 class DeleteTool(Tool):
     def __init__(self, level, grid):
         super().__init__(level, grid)
+        self.rect_start = None  # Shift+drag erases a whole rectangle
+    
+    def deactivate(self, camera):
+        self.rect_start = None
+        super().deactivate(camera)
     
     def handle_event(self, event, camera):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            # The whole drag is a single undo step
+            self.level.history.begin_stroke()
+            
             # Convert mouse position to grid coordinates
             mouse_x, mouse_y = pygame.mouse.get_pos()
             
@@ -286,27 +398,41 @@ class DeleteTool(Tool):
             if grid_x >= self.level.width or grid_y >= self.level.height or grid_x < 0 or grid_y < 0:
                 return
             
-            # Delete elements at this position
-            self.level.delete_at(grid_x, grid_y)
-        
-        elif event.type == pygame.MOUSEMOTION and event.buttons[0]:
-            # Convert mouse position to grid coordinates
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-            
-            # Skip if mouse is in UI area
-            if mouse_y < Config.UI_PANEL_HEIGHT:
-                return
-                
-            grid_x, grid_y = self.grid.screen_to_grid(mouse_x, mouse_y, camera)
-            
-            # Ensure within level bounds
-            if grid_x >= self.level.width or grid_y >= self.level.height or grid_x < 0 or grid_y < 0:
+            if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+                self.rect_start = (grid_x, grid_y)
+                self.preview = (grid_x, grid_y, 1, 1)
                 return
             
             # Delete elements at this position
             self.level.delete_at(grid_x, grid_y)
+            self.last_pos = (grid_x, grid_y)
+        
+        elif event.type == pygame.MOUSEMOTION and event.buttons[0] and self.rect_start:
+            self.preview = self.drag_rect(self.rect_start, camera)
+        
+        elif event.type == pygame.MOUSEMOTION and event.buttons[0]:
+            # Deleted once per frame in update()
+            self.pending_motion.append(event.pos)
+        
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            if self.rect_start:
+                self.level.erase_rect(*self.drag_rect(self.rect_start, camera))
+                self.rect_start = None
+                self.preview = None
+            self.update(camera)
+            self.last_pos = None
+            self.level.history.end_stroke()
+    
+    def update(self, camera):
+        cells = self.take_path(camera)
+        if cells:
+            self.level.delete_cells(cells)
     
     def render_preview(self, surface, camera):
+        if self.rect_start:
+            self.render_rect_preview(surface, camera, (255, 0, 0, 64))
+            return
+        
         # Get current mouse position
         mouse_x, mouse_y = pygame.mouse.get_pos()
         
@@ -563,20 +689,20 @@ class ToolManager:
         
         # Set default tool
         self.current_tool = self.platform_tool
+        self.camera = None  # last camera passed in, to finish a drag on a tool switch
     
     def set_tool(self, tool_name):
         """Set the current tool"""
-        if tool_name == "platform":
-            self.current_tool = self.platform_tool
-        elif tool_name == "ground":
-            self.current_tool = self.ground_tool
-        elif tool_name == "enemy":
-            self.current_tool = self.enemy_tool
-        elif tool_name == "delete":
-            self.current_tool = self.delete_tool
+        tool = {"platform": self.platform_tool, "ground": self.ground_tool,
+                "enemy": self.enemy_tool, "delete": self.delete_tool}.get(tool_name)
+        if tool is None or tool is self.current_tool:
+            return
+        self.current_tool.deactivate(self.camera)
+        self.current_tool = tool
     
     def handle_event(self, event, camera):
         """Pass events to the current tool"""
+        self.camera = camera
         # First check if character selector needs to handle the event
         if isinstance(self.current_tool, EnemyTool):
             if self.character_selector.visible:
@@ -590,10 +716,22 @@ class ToolManager:
         # Then pass to the current tool
         self.current_tool.handle_event(event, camera)
     
+    def update(self, camera):
+        """Let the current tool apply what it collected during the frame"""
+        self.camera = camera
+        self.current_tool.update(camera)
+    
     def render_preview(self, surface, camera):
         """Render the current tool's preview"""
         self.current_tool.render_preview(surface, camera)
         
         # Render character selector if visible
         if isinstance(self.current_tool, EnemyTool) and self.character_selector.visible:
-            self.character_selector.render(surface)
\ No newline at end of file
+            self.character_selector.render(surface)
+    
+    def preview_rect(self, camera):
+        """Screen rect render_preview() may draw in, or None"""
+        rect = self.current_tool.preview_rect(camera)
+        if isinstance(self.current_tool, EnemyTool) and self.character_selector.visible:
+            rect = self.character_selector.rect.union(rect) if rect else self.character_selector.rect
+        return rect
\ No newline at end of file
@@ -2,10 +2,12 @@ import pygame
 import pygame.freetype
 import os
 import sys
+import threading
 from pygame.locals import *
 from editor.config import Config
 from editor.tools import PlatformTool, GroundTool, EnemyTool, DeleteTool
 from editor.file_manager import FileManager
+from editor.validation import validate_level
 
 class ModalDialog:
     """A class to handle modal dialogs that work with the main event loop."""
@@ -468,6 +470,8 @@ class Button:
         return False
 
 class UIManager:
+    TOOLTIP_HEIGHT = 40  # button tooltips hang this far below the panel
+    
     def __init__(self, tool_manager, level, grid, camera):
         self.tool_manager = tool_manager
         self.level = level
@@ -476,8 +480,19 @@ class UIManager:
         
         self.active_dialog = None
         
+        # Level problems shown in the status bar, re-checked after edits on
+        # a snapshot in a worker thread so big levels never stall the editor
+        self.issues = []
+        self.issues_stale = True
+        self.last_validation = -Config.VALIDATION_INTERVAL_MS
+        self._validation = None  # (worker thread, result list) while a check runs
+        self.level.add_listener(self.on_level_change)
+        
         self.init_ui()
     
+    def on_level_change(self, change):
+        self.issues_stale = True
+    
     def init_ui(self):
         self.buttons = []
         
@@ -529,6 +544,37 @@ class UIManager:
                 button.active = isinstance(self.tool_manager.current_tool, DeleteTool)
             elif button.text == "#":
                 button.active = self.grid.show_grid
+        
+        # Publish a finished check, then start the next one at most every
+        # VALIDATION_INTERVAL_MS so drags stay smooth
+        if self._validation and not self._validation[0].is_alive():
+            self.issues = self._validation[1][0]
+            self._validation = None
+        now = pygame.time.get_ticks()
+        if self.issues_stale and not self._validation and now - self.last_validation >= Config.VALIDATION_INTERVAL_MS:
+            self.start_validation()
+            self.last_validation = now
+    
+    @property
+    def validating(self):
+        """True until the issues shown reflect the latest edit"""
+        return self.issues_stale or self._validation is not None
+    
+    def start_validation(self):
+        """Check a snapshot of the level in a worker thread; update() publishes the issues"""
+        snapshot = self.level.snapshot()
+        result = []
+        worker = threading.Thread(target=self._validate, args=(snapshot, result), name="level-validation", daemon=True)
+        self._validation = (worker, result)
+        self.issues_stale = False
+        worker.start()
+    
+    def _validate(self, snapshot, result):
+        try:
+            result.append(validate_level(snapshot))
+        except Exception as e:
+            print(f"[ERROR] Level validation failed: {e}")
+            result.append([])
     
     def handle_event(self, event):
         if self.active_dialog:
@@ -584,6 +630,16 @@ class UIManager:
             elif event.key == pygame.K_s and pygame.key.get_mods() & pygame.KMOD_CTRL:
                 self.save_level()
                 return True
+            elif event.key == pygame.K_z and pygame.key.get_mods() & pygame.KMOD_CTRL:
+                # Ctrl+Shift+Z redoes, like Ctrl+Y
+                if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+                    self.level.redo()
+                else:
+                    self.level.undo()
+                return True
+            elif event.key == pygame.K_y and pygame.key.get_mods() & pygame.KMOD_CTRL:
+                self.level.redo()
+                return True
             elif event.key == pygame.K_o and pygame.key.get_mods() & pygame.KMOD_CTRL:
                 fm = FileManager(self.level)
                 # Instead of blocking, open a LoadLevelDialog in the editor
@@ -1006,6 +1062,17 @@ class UIManager:
             
         return False
     
+    def panel_state(self):
+        """Everything the panel shows; it only has to be pushed to the display when this changes"""
+        stats = self.level.stats
+        return (tuple((button.hovered, button.active) for button in self.buttons),
+                self.level.width, self.level.height, self.grid.cell_size, len(self.issues),
+                stats.platforms, stats.ground_cells, stats.enemies)
+    
+    def panel_rect(self):
+        """Screen area of the panel, with room below it for button tooltips"""
+        return pygame.Rect(0, 0, Config.WINDOW_WIDTH, Config.UI_PANEL_HEIGHT + self.TOOLTIP_HEIGHT)
+    
     def render(self, surface):
         panel_rect = pygame.Rect(0, 0, Config.WINDOW_WIDTH, Config.UI_PANEL_HEIGHT)
         pygame.draw.rect(surface, Config.UI_BG_COLOR, panel_rect)
@@ -1016,9 +1083,17 @@ class UIManager:
         
         font = pygame.font.SysFont(None, 24)
         info_text = f"Level: {self.level.width}x{self.level.height} cells | Cell Size: {self.grid.cell_size}px"
+        if self.issues:
+            info_text += f" | {len(self.issues)} issues"
         text_surface = font.render(info_text, True, Config.UI_FG_COLOR)
         text_rect = text_surface.get_rect(midright=(Config.WINDOW_WIDTH - 10, Config.UI_PANEL_HEIGHT - 12))
         surface.blit(text_surface, text_rect)
         
+        # Element counts are kept up to date by the level, so this is free per frame
+        stats = self.level.stats
+        stats_text = f"{stats.platforms} platforms | {stats.ground_cells} ground cells | {stats.enemies} enemies"
+        stats_surface = font.render(stats_text, True, Config.UI_FG_COLOR)
+        surface.blit(stats_surface, stats_surface.get_rect(midright=(Config.WINDOW_WIDTH - 10, Config.UI_PANEL_HEIGHT - 34)))
+        
         if self.active_dialog:
             self.active_dialog.render(surface)
\ No newline at end of file
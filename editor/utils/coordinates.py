@@ -20,4 +20,24 @@ def grid_to_world(grid_x, grid_y, cell_size):
     """Convert grid coordinates to world coordinates"""
     world_x = grid_x * cell_size
     world_y = grid_y * cell_size
-    return world_x, world_y
\ No newline at end of file
+    return world_x, world_y
+
+def grid_line(x0, y0, x1, y1):
+    """Grid cells on the line from (x0, y0) to (x1, y1), both ends included (Bresenham)"""
+    cells = []
+    dx = abs(x1 - x0)
+    dy = -abs(y1 - y0)
+    step_x = 1 if x0 < x1 else -1
+    step_y = 1 if y0 < y1 else -1
+    error = dx + dy
+    while True:
+        cells.append((x0, y0))
+        if x0 == x1 and y0 == y1:
+            return cells
+        doubled = 2 * error
+        if doubled >= dy:
+            error += dy
+            x0 += step_x
+        if doubled <= dx:
+            error += dx
+            y0 += step_y
@@ -0,0 +1,218 @@
+import heapq
+from bisect import bisect_left
+from itertools import groupby
+from editor.config import Config
+from editor.occupancy import OccupancyGrid
+
+class Issue:
+    """One problem found by validate_level(); rect is the affected cell rectangle"""
+    PLATFORM_OVERLAP = 'platform_overlap'
+    GROUND_UNDER_PLATFORM = 'ground_under_platform'
+    ENEMY_IN_SOLID = 'enemy_in_solid'
+    OUT_OF_BOUNDS = 'out_of_bounds'
+    DUPLICATE_ENEMY = 'duplicate_enemy'
+    UNREACHABLE = 'unreachable'
+    
+    __slots__ = ('type', 'rect', 'message')
+    
+    def __init__(self, issue_type, rect, message):
+        self.type = issue_type
+        self.rect = rect
+        self.message = message
+    
+    def __repr__(self):
+        return f"Issue({self.type}, rect={self.rect})"
+
+KIND_NAMES = {OccupancyGrid.PLATFORM: 'platform', OccupancyGrid.GROUND: 'ground', OccupancyGrid.ENEMY: 'enemy'}
+
+def validate_level(level, max_jump_height=None, max_jump_distance=None):
+    """Check a Level (or LevelSnapshot) and return a list of Issues.
+    
+    Every check is a sort or a sweep, so a level with n elements is checked
+    in O(n log n) plus the number of problems found.
+    """
+    # The configured jump is measured in cells of the default size
+    scale = Config.DEFAULT_CELL_SIZE / max(1, level.cell_size)
+    if max_jump_height is None:
+        max_jump_height = round(Config.MAX_JUMP_HEIGHT * scale)
+    if max_jump_distance is None:
+        max_jump_distance = round(Config.MAX_JUMP_DISTANCE * scale)
+    
+    items = []  # (rect, kind)
+    items.extend((platform.rect, OccupancyGrid.PLATFORM) for platform in level.platforms)
+    items.extend((ground.rect, OccupancyGrid.GROUND) for ground in level.ground_blocks)
+    items.extend((enemy.rect, OccupancyGrid.ENEMY) for enemy in level.enemies)
+    
+    issues = find_overlaps(items)
+    issues.extend(find_out_of_bounds(items, level.width, level.height))
+    issues.extend(find_duplicate_enemies([rect for rect, kind in items if kind == OccupancyGrid.ENEMY]))
+    issues.extend(find_unreachable(items, level.height, max_jump_height, max_jump_distance))
+    return issues
+
+def _intersection(a, b):
+    left = max(a[0], b[0])
+    top = max(a[1], b[1])
+    return left, top, min(a[0] + a[2], b[0] + b[2]) - left, min(a[1] + a[3], b[1] + b[3]) - top
+
+def find_overlaps(items):
+    """Overlapping platforms, ground under platforms and enemies inside solid cells.
+    
+    Sweeps the rectangles left to right. The ones still open at the sweep
+    position are kept per row, so each new rectangle is only compared with
+    open rectangles on its own rows. Ground runs never overlap each other
+    and stacked enemies are reported by find_duplicate_enemies().
+    """
+    issues = []
+    order = sorted(range(len(items)), key=lambda i: items[i][0][0])
+    closing = []  # heap of (right edge, item index)
+    open_rows = {}  # y -> set of open item indices
+    for i in order:
+        rect, kind = items[i]
+        x, y, width, height = rect
+        while closing and closing[0][0] <= x:
+            _, done = heapq.heappop(closing)
+            done_y, done_height = items[done][0][1], items[done][0][3]
+            for row in range(done_y, done_y + done_height):
+                open_rows[row].discard(done)
+        
+        seen = set()
+        for row in range(y, y + height):
+            for other in open_rows.get(row, ()):
+                if other in seen:
+                    continue
+                seen.add(other)
+                other_rect, other_kind = items[other]
+                kinds = {kind, other_kind}
+                if kinds == {OccupancyGrid.PLATFORM}:
+                    issue_type = Issue.PLATFORM_OVERLAP
+                elif kinds == {OccupancyGrid.PLATFORM, OccupancyGrid.GROUND}:
+                    issue_type = Issue.GROUND_UNDER_PLATFORM
+                elif OccupancyGrid.ENEMY in kinds and len(kinds) == 2:
+                    issue_type = Issue.ENEMY_IN_SOLID
+                else:
+                    continue
+                overlap = _intersection(rect, other_rect)
+                issues.append(Issue(issue_type, overlap,
+                                    f"{KIND_NAMES[other_kind]} at {other_rect[:2]} overlaps {KIND_NAMES[kind]} at {rect[:2]}"))
+        
+        if width > 0 and height > 0:
+            for row in range(y, y + height):
+                open_rows.setdefault(row, set()).add(i)
+            heapq.heappush(closing, (x + width, i))
+    return issues
+
+def find_out_of_bounds(items, width, height):
+    """Elements reaching outside the level (e.g. in files saved by older versions)"""
+    issues = []
+    for rect, kind in items:
+        x, y, rect_width, rect_height = rect
+        if x < 0 or y < 0 or x + rect_width > width or y + rect_height > height:
+            issues.append(Issue(Issue.OUT_OF_BOUNDS, rect,
+                                f"{KIND_NAMES[kind]} at {rect[:2]} lies outside the {width}x{height} level"))
+    return issues
+
+def find_duplicate_enemies(enemy_rects):
+    """Cells holding more than one enemy"""
+    issues = []
+    for cell, stacked in groupby(sorted(rect[:2] for rect in enemy_rects)):
+        count = len(list(stacked))
+        if count > 1:
+            issues.append(Issue(Issue.DUPLICATE_ENEMY, (cell[0], cell[1], 1, 1), f"{count} enemies on cell {cell}"))
+    return issues
+
+class _FloorTree:
+    """Segment tree over column intervals holding the nearest floor row seen so far.
+    
+    Floors are added from the bottom of the level upwards, so a new floor is
+    always at or above the old ones and lowering the stored row to it
+    (range chmin) is all an update needs. Queries return the minimum row.
+    """
+    def __init__(self, size, bottom):
+        self.size = max(1, size)
+        self.low = [bottom] * (4 * self.size)
+        self.pending = [None] * (4 * self.size)
+    
+    def _push(self, node):
+        value = self.pending[node]
+        if value is None:
+            return
+        for child in (2 * node, 2 * node + 1):
+            self.low[child] = min(self.low[child], value)
+            if self.pending[child] is None or value < self.pending[child]:
+                self.pending[child] = value
+        self.pending[node] = None
+    
+    def lower(self, lo, hi, value, node=1, left=0, right=None):
+        """Lower every column interval in [lo, hi) to at most value"""
+        if right is None:
+            right = self.size
+        if hi <= left or right <= lo or lo >= hi:
+            return
+        if lo <= left and right <= hi:
+            self.low[node] = min(self.low[node], value)
+            if self.pending[node] is None or value < self.pending[node]:
+                self.pending[node] = value
+            return
+        self._push(node)
+        middle = (left + right) // 2
+        self.lower(lo, hi, value, 2 * node, left, middle)
+        self.lower(lo, hi, value, 2 * node + 1, middle, right)
+        self.low[node] = min(self.low[2 * node], self.low[2 * node + 1])
+    
+    def lowest(self, lo, hi, node=1, left=0, right=None):
+        """Minimum stored row over column intervals [lo, hi)"""
+        if right is None:
+            right = self.size
+        if hi <= left or right <= lo:
+            return float('inf')
+        if lo <= left and right <= hi:
+            return self.low[node]
+        self._push(node)
+        middle = (left + right) // 2
+        return min(self.lowest(lo, hi, 2 * node, left, middle),
+                   self.lowest(lo, hi, 2 * node + 1, middle, right))
+
+def find_unreachable(items, level_height, max_jump_height, max_jump_distance):
+    """Platforms too high above every surface the player could jump from.
+    
+    The surface below a platform is the highest solid top under its bottom
+    edge within max_jump_distance columns to either side, or the level
+    bottom. Platforms more than max_jump_height cells above it are reported.
+    Enemies are not checked since levels place flying enemies in mid-air.
+    Surfaces and platforms are swept bottom to top while a segment tree over
+    the compressed columns tracks the nearest surface in each column.
+    """
+    solids = [rect for rect, kind in items if kind != OccupancyGrid.ENEMY]
+    placed = [(rect, kind) for rect, kind in items if kind == OccupancyGrid.PLATFORM]
+    if not placed:
+        return []
+    
+    reach = max_jump_distance
+    edges = set()
+    for x, _, width, _ in solids:
+        edges.update((x, x + width))
+    for (x, _, width, _), _ in placed:
+        edges.update((x - reach, x + width + reach))
+    edges = sorted(edges)
+    tree = _FloorTree(len(edges) - 1, level_height)
+    
+    # Solids are added at their top row, platforms are checked at their
+    # bottom edge; at equal rows the solid goes first so it counts as floor
+    events = [(-y, 0, i) for i, (_, y, _, _) in enumerate(solids)]
+    events.extend((-(rect[1] + rect[3]), 1, i) for i, (rect, _) in enumerate(placed))
+    events.sort()
+    
+    issues = []
+    for _, is_placed, i in events:
+        if not is_placed:
+            x, y, width, _ = solids[i]
+            tree.lower(bisect_left(edges, x), bisect_left(edges, x + width), y)
+            continue
+        rect, kind = placed[i]
+        x, y, width, _ = rect
+        floor = tree.lowest(bisect_left(edges, x - reach), bisect_left(edges, x + width + reach))
+        rise = floor - y
+        if rise > max_jump_height:
+            issues.append(Issue(Issue.UNREACHABLE, rect,
+                                f"{KIND_NAMES[kind]} at {rect[:2]} is {rise} cells above the nearest surface (max {max_jump_height})"))
+    return issues
@@ -22,6 +22,11 @@ from editor.config import Config
 from editor.grid import Grid
 from editor.camera import Camera
 from editor.level import Level
+from editor.occupancy import OccupancyGrid
+from editor.autotile import Autotiler
+from editor.parallax import ParallaxCache
+from editor.render_cache import StaticLayerCache
+from editor.presenter import DamagePresenter
 from editor.tools import ToolManager
 from editor.ui import UIManager, ModalDialog, SaveDialog
 # Import the new LoadLevelDialog for loading levels
@@ -55,6 +60,9 @@ class LevelEditor:
         self.tool_manager = ToolManager(self.level, self.grid)
         self.ui_manager = UIManager(self.tool_manager, self.level, self.grid, self.camera)
         self.file_manager = FileManager(self.level)
+        self.autotiler = Autotiler(self.level, Config.AUTOTILE_NEIGHBOURS)
+        self.parallax = ParallaxCache()
+        self.static_cache = StaticLayerCache(self.level, self.autotiler)
         
         # Level editor state
         self.has_loaded_level = False
@@ -63,6 +71,16 @@ class LevelEditor:
         # Main loop flag
         self.running = True
         
+        # Idle mode: frames are only drawn after input, a level change or a
+        # camera move; otherwise the loop sleeps in pygame.event.wait
+        self.needs_redraw = True
+        self.last_camera_x = None
+        self.level.add_listener(self.on_level_change)
+        
+        # Frames are pushed to the display as damaged rects while the camera is still
+        self.presenter = DamagePresenter()
+        self.panel_state = None
+        
         # Font for welcome screen
         self.font_large = pygame.font.SysFont(None, 48)
         self.font_medium = pygame.font.SysFont(None, 32)
@@ -114,10 +132,15 @@ class LevelEditor:
                 self.level.fg_path = fg_path
                 print(f"[DEBUG] Foreground loaded successfully, size: {self.level.foreground.get_size()}")
                 
-                # Adjust level height based on foreground height
+                # Adjust level height based on foreground height. resize() crops,
+                # so a loaded level taller than the foreground keeps its saved rows
                 fg_height = self.level.foreground.get_height()
-                self.level.height = fg_height // self.level.cell_size
-                self.level.height_pixels = fg_height
+                fg_rows = fg_height // self.level.cell_size
+                if self.has_loaded_level and fg_rows < self.level.height:
+                    print(f"[DEBUG] Preserving level height at {self.level.height} cells (loaded level)")
+                else:
+                    self.level.resize(self.level.width, fg_rows)
+                    self.level.height_pixels = fg_height
             else:
                 print(f"[ERROR] Foreground image not found at path: {fg_path}")
                 # Create a placeholder foreground
@@ -138,7 +161,7 @@ class LevelEditor:
             
             if not self.has_loaded_level:
                 old_width = self.level.width
-                self.level.width = fg_width // self.level.cell_size
+                self.level.resize(fg_width // self.level.cell_size, self.level.height)
                 self.level.width_pixels = fg_width
                 print(f"[DEBUG] Adjusting level width from {old_width} to {self.level.width} cells (new level)")
             else:
@@ -156,7 +179,7 @@ class LevelEditor:
         
         # Load enemy sprites
         # For now, just create placeholder sprites
-        self.level.enemy_images = {}
+        self.level.enemy_images.clear()
         
         # Load enemy sprites from the characters directory
         from editor.utils.assets import scan_character_spritesheets, load_sprite_sheet
@@ -214,7 +237,50 @@ class LevelEditor:
             sprite.fill((255, 0, 255))
             return [sprite]
     
-    def handle_editor_events(self):
+    def on_level_change(self, change):
+        self.needs_redraw = True
+        # Ground frames around the change may change too, and enemy sprites overhang their cell
+        cell_size = self.grid.cell_size
+        margin = cell_size
+        if change.kind in (OccupancyGrid.ENEMY, None):
+            margin += max((max(sprite.get_size()) for sprite in self.level.enemy_images.values()), default=0)
+        x, y, width, height = change.rect
+        self.presenter.damage((x * cell_size - self.camera.x - margin, y * cell_size + Config.UI_PANEL_HEIGHT - margin,
+                               width * cell_size + 2 * margin, height * cell_size + 2 * margin))
+    
+    def needs_frame(self):
+        """True when the next editor frame would not look the same as the last one"""
+        return bool(self.needs_redraw or self.camera.x != self.last_camera_x or self.ui_manager.active_dialog)
+    
+    def is_idle(self):
+        """True when the loop can sleep until input arrives (no frame or validation due)"""
+        return not (self.needs_frame() or self.ui_manager.validating)
+    
+    def poll_events(self, idle=False):
+        """Events queued since the last frame.
+        
+        When idle, first sleeps until an event arrives (or IDLE_TIMEOUT_MS
+        passes), so an untouched editor uses no CPU but still reacts to
+        input at once. Any event flags the next frame for drawing.
+        """
+        if idle:
+            event = pygame.event.wait(Config.IDLE_TIMEOUT_MS)
+            if event.type == pygame.NOEVENT:
+                return []
+            events = [event] + pygame.event.get()
+        else:
+            events = pygame.event.get()
+        if events:
+            self.needs_redraw = True
+        for event in events:
+            # Key presses and panel clicks can open dialogs that draw straight
+            # to the display, and window events can wipe it
+            if event.type in (pygame.KEYDOWN, pygame.VIDEORESIZE, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED) or \
+                    (event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP) and event.pos[1] < Config.UI_PANEL_HEIGHT):
+                self.presenter.invalidate()
+        return events
+    
+    def handle_editor_events(self, idle=False):
         global current_app_state, state_change_requested
 
         # Check for state change request BEFORE processing any events
@@ -222,7 +288,7 @@ class LevelEditor:
             print(f"[STATE] Change requested before event processing: {state_change_requested}")
             return
 
-        for event in pygame.event.get():
+        for event in self.poll_events(idle):
             # Check for application exit
             if event.type == pygame.QUIT:
                 state_change_requested = AppState.EXITING
@@ -323,15 +389,20 @@ class LevelEditor:
             self.camera.handle_event(event)
     
     def update(self):
+        validating = self.ui_manager.validating
+        self.tool_manager.update(self.camera)
         self.camera.update()
         self.ui_manager.update()
+        if validating and not self.ui_manager.validating:
+            self.needs_redraw = True  # show the new validation results
     
     def render(self):
+        self.needs_redraw = False
+        self.last_camera_x = self.camera.x
         self.screen.fill((30, 30, 30))
         
         if self.has_loaded_level:
-            self.render_background()
-            self.render_foreground()
+            self.render_parallax()
             self.render_level_elements()
         
         if self.grid.show_grid and self.has_loaded_level:
@@ -340,81 +411,27 @@ class LevelEditor:
         
         self.ui_manager.render(self.screen)
         
+        overlays = []
         if self.has_loaded_level:
             self.tool_manager.render_preview(self.screen, self.camera)
-            self.render_mouse_position()
+            overlays.append(self.tool_manager.preview_rect(self.camera))
+            overlays.append(self.render_mouse_position())
         
-        pygame.display.flip()
+        self.present(overlays)
     
-    def render_background(self):
-        if not self.level.background:
-            return
-        
-        # Use custom bg_scroll_rate if available, otherwise fallback to default 0.25
-        parallax_factor = getattr(self.level, 'bg_scroll_rate', 0.25)
-        
-        original_clip = self.screen.get_clip()
-        
-        # Always ensure the background is visible regardless of camera position
-        clip_rect = pygame.Rect(
-            0, 
-            Config.UI_PANEL_HEIGHT,
-            Config.WINDOW_WIDTH,
-            Config.WINDOW_HEIGHT - Config.UI_PANEL_HEIGHT
-        )
-        self.screen.set_clip(clip_rect)
-        
-        # Calculate the starting position for the leftmost tile
-        raw_offset = -self.camera.x * parallax_factor
-        bg_width = self.level.background.get_width()
-        
-        # Calculate a start_x that ensures tiling starts at or before x=0
-        start_x = raw_offset % bg_width
-        if start_x > 0:
-            start_x -= bg_width
-            
-        # Draw tiles until we cover the entire window width
-        x = start_x
-        while x < Config.WINDOW_WIDTH:
-            self.screen.blit(self.level.background, (x, Config.UI_PANEL_HEIGHT))
-            x += bg_width
-        
-        self.screen.set_clip(original_clip)
+    def present(self, overlays):
+        """Push the frame to the display: the damaged rects while the view is still, else all of it"""
+        panel_state = self.ui_manager.panel_state()
+        if panel_state != self.panel_state:
+            self.panel_state = panel_state
+            self.presenter.damage(self.ui_manager.panel_rect())
+        view = (self.camera.x, self.screen.get_size(), self.has_loaded_level, self.grid.show_grid, self.grid.cell_size,
+                self.level.width, self.level.height, self.level.background, self.level.foreground)
+        self.presenter.present(self.screen, view, overlays, full=bool(self.ui_manager.active_dialog))
     
-    def render_foreground(self):
-        if not self.level.foreground:
-            return
-        
-        original_clip = self.screen.get_clip()
-        
-        # Always ensure the foreground is visible regardless of camera position
-        clip_rect = pygame.Rect(
-            0, 
-            Config.UI_PANEL_HEIGHT,
-            Config.WINDOW_WIDTH,
-            Config.WINDOW_HEIGHT - Config.UI_PANEL_HEIGHT
-        )
-        self.screen.set_clip(clip_rect)
-        
-        # Use custom fg_scroll_rate if available, otherwise fallback to default 1.0
-        parallax_factor = getattr(self.level, 'fg_scroll_rate', 1.0)
-        
-        # Calculate the starting position for the leftmost tile
-        raw_offset = -self.camera.x * parallax_factor
-        fg_width = self.level.foreground.get_width()
-        
-        # Calculate a start_x that ensures tiling starts at or before x=0
-        start_x = raw_offset % fg_width
-        if start_x > 0:
-            start_x -= fg_width
-            
-        # Draw tiles until we cover the entire window width
-        x = start_x
-        while x < Config.WINDOW_WIDTH:
-            self.screen.blit(self.level.foreground, (x, Config.UI_PANEL_HEIGHT))
-            x += fg_width
-        
-        self.screen.set_clip(original_clip)
+    def render_parallax(self):
+        """Draw the background and foreground layers from their cached strips"""
+        self.parallax.render(self.screen, self.level, self.camera.x)
     
     def render_level_elements(self):
         # Save the current clip area to restore later
@@ -422,43 +439,28 @@ class LevelEditor:
         # Remove any clipping to ensure sprites can render fully
         self.screen.set_clip(None)
         
-        # Render platforms
-        for platform in self.level.platforms:
-            screen_x = platform['x'] * self.grid.cell_size - self.camera.x
-            screen_y = platform['y'] * self.grid.cell_size + Config.UI_PANEL_HEIGHT
-            width = platform['width'] * self.grid.cell_size
-            height = platform['height'] * self.grid.cell_size
-            
-            if screen_x + width > 0 and screen_x < Config.WINDOW_WIDTH:
-                pygame.draw.rect(
-                    self.screen,
-                    (150, 75, 0),
-                    (screen_x, screen_y, width, height)
-                )
+        # Visible cell range, used to look up only the on-screen elements
+        cell_size = self.grid.cell_size
+        first_col = int(self.camera.x // cell_size)
+        visible_cols = Config.WINDOW_WIDTH // cell_size + 2
         
-        # Render ground blocks
-        for ground in self.level.ground_blocks:
-            screen_x = ground['x'] * self.grid.cell_size - self.camera.x
-            screen_y = ground['y'] * self.grid.cell_size + Config.UI_PANEL_HEIGHT
-            width = ground['width'] * self.grid.cell_size
-            
-            if screen_x + width > 0 and screen_x < Config.WINDOW_WIDTH:
-                pygame.draw.rect(
-                    self.screen,
-                    (70, 40, 0),
-                    (screen_x, screen_y, width, self.grid.cell_size)
-                )
+        # Tile layers, platforms and ground come baked from the static cache
+        self.static_cache.render(self.screen, self.camera.x, cell_size)
         
-        # Render enemies
-        for enemy in self.level.enemies:
-            screen_x = enemy['x'] * self.grid.cell_size - self.camera.x
-            screen_y = enemy['y'] * self.grid.cell_size + Config.UI_PANEL_HEIGHT
-            
-            enemy_type = enemy.get('type', 'armadillo')
+        # Render enemies near the viewport; wide sprites overhang their cell,
+        # so widen the column range by the widest sprite plus the margin below
+        sprite_overhang = max((sprite.get_width() for sprite in self.level.enemy_images.values()), default=0) // 2 + 64
+        margin_cols = sprite_overhang // cell_size + 1
+        nearby_enemies = self.level.enemies_in_rect(
+            first_col - margin_cols, 0, visible_cols + 2 * margin_cols, self.level.height
+        )
+        for enemy in nearby_enemies:
+            screen_x = enemy.x * self.grid.cell_size - self.camera.x
+            screen_y = enemy.y * self.grid.cell_size + Config.UI_PANEL_HEIGHT
             
-            # Draw the enemy sprite if it's in the level image dictionary
-            if enemy_type in self.level.enemy_images:
-                sprite = self.level.enemy_images[enemy_type]
+            # Draw the enemy sprite if the level has one for its type
+            sprite = self.level.enemy_images.sprite(enemy.type_id)
+            if sprite is not None:
                 sprite_width = sprite.get_width()
                 sprite_height = sprite.get_height()
                 
@@ -520,6 +522,7 @@ class LevelEditor:
         text_rect.right = Config.WINDOW_WIDTH - 10
         text_rect.y = 10
         self.screen.blit(text_surface, text_rect)
+        return text_rect
         
     def show_new_level_dialog(self):
         """Show the new level creation dialog"""
@@ -720,15 +723,13 @@ class LevelEditor:
                                         level_height = 1
                                         
                                     # Set level dimensions
-                                    self.level.cell_size = cell_size
+                                    self.level.set_cell_size(cell_size)
                                     self.grid.cell_size = cell_size
                                     
                                     # Update level dimensions
                                     fg_width = self.level.foreground.get_width()
                                     fg_height = self.level.foreground.get_height()
-                                    self.level.width = level_width
-                                    self.level.height = level_height
-                                    self.level.width_pixels = level_width * cell_size
+                                    self.level.resize(level_width, level_height)
                                     self.level.height_pixels = fg_height
                                     
                                     # Load background image (if provided)
@@ -1387,12 +1388,12 @@ class LevelEditor:
             'exit': exit_btn_rect
         }
     
-    def handle_welcome_events(self):
+    def handle_welcome_events(self, idle=False):
         global state_change_requested
         
         # If there is an active dialog (like a LoadLevelDialog), let it handle events
         if self.ui_manager.active_dialog:
-            for event in pygame.event.get():
+            for event in self.poll_events(idle):
                 if event.type == pygame.QUIT:
                     state_change_requested = AppState.EXITING
                     return
@@ -1404,7 +1405,7 @@ class LevelEditor:
                     self.ui_manager.handle_event(event)
             return
         
-        for event in pygame.event.get():
+        for event in self.poll_events(idle):
             if event.type == pygame.QUIT:
                 state_change_requested = AppState.EXITING
                 return
@@ -1505,24 +1506,29 @@ class LevelEditor:
                         self.ui_manager.active_dialog = None
                 current_app_state = new_state
                 state_change_requested = None
+                self.needs_redraw = True
+                self.presenter.invalidate()
                 print(f"[STATE] Now in state: {current_app_state}")
                 continue
             
             if current_app_state == AppState.WELCOME_SCREEN:
-                self.render_welcome_screen()
-                self.handle_welcome_events()
+                if self.needs_redraw:
+                    self.needs_redraw = False
+                    self.render_welcome_screen()
+                self.handle_welcome_events(idle=True)
                 
                 if state_change_requested:
                     print(f"[STATE] State change requested during welcome screen: {state_change_requested}")
                     continue
                 
             elif current_app_state == AppState.LEVEL_EDITOR:
-                self.handle_editor_events()
+                self.handle_editor_events(self.is_idle())
                 if state_change_requested:
                     print(f"[STATE] State change requested after editor events: {state_change_requested}")
                     continue
                 self.update()
-                self.render()
+                if self.needs_frame():
+                    self.render()
                 if state_change_requested:
                     print(f"[STATE] State change requested after editor rendering: {state_change_requested}")
                     continue
@@ -1537,5 +1543,10 @@ class LevelEditor:
         sys.exit()
 
 if __name__ == "__main__":
+    # Batch mode when level files/options are given (e.g. main.py --compact levels/level1.json)
+    if len(sys.argv) > 1:
+        from editor.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+    
     editor = LevelEditor()
     editor.run()
\ No newline at end of file
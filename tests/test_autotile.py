@@ -0,0 +1,24 @@
+import numpy as np
+from editor.level import Level
+from editor.autotile import Autotiler
+
+def test_ground_edits_report_only_changed_cells():
+    level = Level()
+    level.resize(128, 16)
+    autotiler = Autotiler(level)
+    level.fill_rect(2, 5, 60, 1)
+    autotiler.frames_in_rect(0, 0, level.width, level.height)
+    computed = []
+    compute = autotiler._compute
+    def counting_compute(x, y, width, height):
+        computed.append(width * height)
+        return compute(x, y, width, height)
+    autotiler._compute = counting_compute
+
+    for edit in (lambda: level.add_ground(62, 5), lambda: level.delete_at(30, 5), lambda: level.add_ground(30, 5)):
+        computed.clear()
+        edit()
+        autotiler.frames_in_rect(0, 0, level.width, level.height)
+        assert sum(computed) == 9  # the cell and its neighbours
+    fresh = Autotiler(level).frames_in_rect(0, 0, level.width, level.height)
+    assert np.array_equal(fresh, autotiler.frames_in_rect(0, 0, level.width, level.height))
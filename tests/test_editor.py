@@ -0,0 +1,19 @@
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from main import LevelEditor
+
+def test_loading_keeps_rows_below_the_foreground():
+    editor = LevelEditor()
+    editor.level.from_dict({
+        'dimensions': {'width': 96, 'height': 20, 'cell_size': 32},
+        'ground_blocks': [{'x': 0, 'y': 19, 'width': 10}],
+        'platforms': [{'x': 4, 'y': 17, 'width': 3, 'height': 1}],
+        'enemies': [{'x': 2, 'y': 18, 'type': 'armadillo_warrior'}]
+    })
+    editor.has_loaded_level = True
+    editor.load_assets()  # default foreground is 512 px, 16 rows
+    assert editor.level.height == 20
+    assert [run.rect for run in editor.level.ground_blocks] == [(0, 19, 10, 1)]
+    assert len(editor.level.platforms) == 1 and len(editor.level.enemies) == 1
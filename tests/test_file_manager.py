@@ -0,0 +1,17 @@
+import json
+from editor.level import Level
+from editor.file_manager import FileManager
+
+def test_compacted_save_leaves_the_level_alone(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    level = Level()
+    level.resize(200, 16)
+    level.history.clear()
+    for x in range(3):
+        level.add_platform(x, 0, 1, 1)
+    path = FileManager(level).save_level('level.json')
+    with open(path) as f:
+        assert json.load(f)['platforms'] == [{'x': 0, 'y': 0, 'width': 3, 'height': 1}]
+    assert len(level.platforms) == 3
+    assert level.undo()
+    assert len(level.platforms) == 2
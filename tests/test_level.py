@@ -0,0 +1,187 @@
+import os
+import random
+import numpy as np
+import pytest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from editor.level import Level
+from editor.occupancy import OccupancyGrid
+
+def make_level(width=200, height=16):
+    level = Level()
+    level.resize(width, height)
+    level.history.clear()
+    return level
+
+def ground_cells(level):
+    cells = set()
+    for run in level.ground_blocks:
+        cells.update((x, run.y) for x in range(run.x, run.x + run.width))
+    return cells
+
+def contents(level):
+    """Level elements, ignoring the order they are stored in and the save metadata"""
+    data = level.to_dict()
+    del data['metadata']
+    for key in ('platforms', 'ground_blocks', 'enemies'):
+        data[key] = sorted(data[key], key=lambda element: sorted(element.items()))
+    return data
+
+def random_edits(level, seed, count=300):
+    rng = random.Random(seed)
+    for _ in range(count):
+        x = rng.randrange(level.width)
+        y = rng.randrange(level.height)
+        op = rng.randrange(5)
+        if op == 0:
+            level.add_ground(x, y, rng.randint(1, 90))
+        elif op == 1:
+            level.delete_at(x, y)
+        elif op == 2:
+            level.fill_rect(x - 3, y, rng.randint(1, 20), rng.randint(1, 3))
+        elif op == 3:
+            level.erase_rect(x, y, rng.randint(1, 40), rng.randint(1, 3))
+        else:
+            level.add_platform(x, y, rng.randint(1, 10), rng.randint(1, 2))
+
+def assert_consistent(level):
+    """The occupancy grid and stats agree with the stored elements"""
+    cells = ground_cells(level)
+    # Elements may hang past the right edge of the level
+    width = max([level.width] + [x + 1 for x, _ in cells] + [platform.x + platform.width for platform in level.platforms])
+    expected = np.zeros((level.height, width), dtype=bool)
+    for x, y in cells:
+        expected[y, x] = True
+    assert (level.occupied(OccupancyGrid.GROUND, 0, 0, width, level.height) == expected).all()
+    assert level.stats.ground_cells == len(cells)
+
+    expected[:] = False
+    for platform in level.platforms:
+        expected[platform.y:platform.y + platform.height, platform.x:platform.x + platform.width] = True
+    assert (level.occupied(OccupancyGrid.PLATFORM, 0, 0, width, level.height) == expected).all()
+
+    # Ground runs on a row never overlap or touch
+    rows = {}
+    for run in level.ground_blocks:
+        rows.setdefault(run.y, []).append((run.x, run.x + run.width))
+    for runs in rows.values():
+        runs.sort()
+        assert all(end < start for (_, end), (start, _) in zip(runs, runs[1:]))
+
+# Snapshots
+
+def test_snapshot_ignores_later_edits():
+    level = make_level(300)
+    level.add_ground(0, 5, 200)
+    level.add_platform(10, 2, 80, 2)
+    level.add_enemy(3, 4, 'armadillo_warrior')
+    before = level.to_dict()
+    snapshot = level.snapshot()
+
+    level.delete_at(100, 5)
+    level.delete_at(3, 4)
+    level.erase_rect(0, 0, 20, 16)
+    level.move_region(10, 2, 30, 2, 5, 5)
+    level.resize(400, 20)
+    level.clear()
+
+    after = snapshot.to_dict()
+    for key in ('platforms', 'ground_blocks', 'enemies', 'dimensions'):
+        assert after[key] == before[key]
+
+def test_snapshot_shares_untouched_chunks():
+    level = make_level(300)
+    level.add_ground(0, 5, 300)
+    snapshot = level.snapshot()
+    level.add_ground(0, 9, 1)
+    shared = [chunk for index, chunk in level._chunks.items() if snapshot._chunks.get(index) is chunk]
+    assert len(shared) == len(level._chunks) - 1
+
+# Undo and redo
+
+def test_undo_redo_round_trip():
+    level = make_level()
+    states = [contents(level)]
+    rng = random.Random(1)
+    for _ in range(60):
+        random_edits(level, rng.random(), count=1)
+        if contents(level) != states[-1]:
+            states.append(contents(level))
+    for state in reversed(states[:-1]):
+        assert level.undo()
+        assert contents(level) == state
+        assert_consistent(level)
+    assert not level.undo()
+    for state in states[1:]:
+        assert level.redo()
+        assert contents(level) == state
+    assert_consistent(level)
+
+# Occupancy
+
+@pytest.mark.parametrize('seed', range(4))
+def test_occupancy_matches_elements(seed):
+    level = make_level()
+    random_edits(level, seed)
+    assert_consistent(level)
+
+# Rescaling
+
+@pytest.mark.parametrize('size, sizes', [((80, 19), (64, 24)), ((201, 16), (16, 8)), ((97, 13), (20, 44))])
+def test_chained_rescales_keep_the_level_consistent(size, sizes):
+    level = make_level(*size)
+    random_edits(level, 5, count=80)
+    for cell_size in sizes:
+        level.rescale(cell_size)
+        assert (level.width_pixels, level.height_pixels) == (level.width * cell_size, level.height * cell_size)
+        assert_consistent(level)
+        for element in level.platforms + level.ground_blocks + level.enemies:
+            x, y, width, height = element.rect
+            assert 0 <= x and x + width <= level.width and 0 <= y and y + height <= level.height
+        level.add_ground(0, level.height - 1, 10)
+        assert_consistent(level)
+
+def test_rescale_reports_elements_cut_off():
+    level = make_level(10, 4)
+    level.add_ground(5, 1, 20)
+    level.add_platform(12, 0, 2, 1)
+    level.add_enemy(15, 2, 'armadillo_warrior')
+    lossy = level.rescale(16)
+    assert (OccupancyGrid.PLATFORM, (12, 0, 2, 1), None) in lossy
+    assert (OccupancyGrid.ENEMY, (15, 2, 1, 1), None) in lossy
+    assert (OccupancyGrid.GROUND, (5, 1, 20, 1), (10, 2, 10, 2)) in lossy
+    assert level.platforms == [] and level.enemies == []
+    assert level.stats.ground_cells == 20
+
+# Tile layers
+
+def test_remove_tile_layer_clears_history():
+    level = make_level()
+    level.add_tile_layer('decor')
+    level.fill_tiles('decor', 0, 0, 4, 1, 2)
+    level.fill_tiles('decor', 0, 0, 4, 1, 0)
+    level.remove_tile_layer('decor')
+    assert not level.undo()
+    assert level.tile_layers == {}
+
+# Resizing
+
+def test_shrinking_resize_clears_history():
+    level = make_level(64)
+    level.add_ground(50, 3, 5)
+    level.erase_rect(50, 0, 14, 16)
+    level.resize(40, 16)
+    assert not level.undo()
+    assert level.ground_blocks == []
+
+# Filling
+
+def test_fill_rect_is_clipped_to_the_level():
+    level = make_level(64)
+    level.fill_rect(0, 15, 3, 3)
+    level.fill_rect(-5, 0, 3, 1)
+    level.fill_rect(62, 0, 5, 2, 'platform')
+    assert [run.rect for run in level.ground_blocks] == [(0, 15, 3, 1)]
+    assert [platform.rect for platform in level.platforms] == [(62, 0, 2, 2)]
+    assert level.stats.ground_cells == 3
@@ -0,0 +1,34 @@
+import os
+from unittest import mock
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from editor.config import Config
+from editor.level import Level
+from editor.grid import Grid
+from editor.camera import Camera
+from editor.tools import ToolManager
+
+def test_switching_tools_ends_the_drag_stroke():
+    pygame.init()
+    pygame.display.set_mode((Config.WINDOW_WIDTH, Config.WINDOW_HEIGHT))
+    level = Level()
+    level.resize(200, 16)
+    camera = Camera(level)
+    tools = ToolManager(level, Grid())
+    tools.set_tool('ground')
+    y = Config.UI_PANEL_HEIGHT + 4
+    with mock.patch('pygame.mouse.get_pos', return_value=(5, y)):
+        tools.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(5, y)), camera)
+    tools.handle_event(pygame.event.Event(pygame.MOUSEMOTION, buttons=(1, 0, 0), pos=(300, y), rel=(0, 0)), camera)
+    tools.set_tool('enemy')
+    level.add_enemy(3, 3, 'armadillo_warrior')
+    ground = [run.rect for run in level.ground_blocks]
+    assert ground
+
+    assert level.undo()
+    assert level.enemies == []
+    assert [run.rect for run in level.ground_blocks] == ground
+    assert level.undo()
+    assert level.ground_blocks == []